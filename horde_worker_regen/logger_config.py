@@ -1,12 +1,14 @@
 """Utilities for configuring the logger with a standardized format."""
 
+import atexit
 import os
 import re
 import sys
 import threading
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Iterable
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 from loguru import logger
 
@@ -23,65 +25,97 @@ def _is_lora_shape_noise(record: dict[str, Any]) -> bool:
     return bool(_LORA_SHAPE_NOISE_RE.match(record.get("message", "")))
 
 
-def create_level_format_function(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -> Callable[[dict[str, Any]], str]:
-    """Create a format function for console output with level-based colors.
+_SGR_CODES: dict[str, str] = {
+    "bold": "1",
+    "dim": "2",
+    "underline": "4",
+    "red": "31",
+    "green": "32",
+    "yellow": "33",
+    "blue": "34",
+    "magenta": "35",
+    "cyan": "36",
+    "white": "37",
+}
 
-    Returns a callable suitable for ``logger.add(format=...)``.  The timestamp
-    is never colored so it is always easy to parse.  Only the level indicator
-    and message body are colored.
+
+def _merge_sgr(tags: Iterable[str]) -> str:
+    """Combine color/style tags into a single ANSI SGR escape sequence.
+
+    Loguru expands ``<bold><cyan>`` into two separate escapes (``\\x1b[1m\\x1b[36m``); a merged
+    ``\\x1b[1;36m`` writes fewer bytes and costs the terminal one state transition.
 
     Args:
-        time_format: Loguru time format string.  Defaults to millisecond precision.
+        tags: Tag names without angle brackets, e.g. ``("bold", "fg #8B0000")``.  Named styles
+            and colors use the keys of ``_SGR_CODES``; ``fg #RRGGBB`` produces a truecolor code.
     """
-    level_formats = {
-        "TRACE": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <dim><cyan>{{level: <8}}</cyan></dim> <dim>|</dim> <dim>{{message}}</dim>"
-        ),
-        "DEBUG": f"{{time:{time_format}}} <dim>|</dim> <blue>{{level: <8}}</blue> <dim>|</dim> {{message}}",
-        "INFO": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <bold><cyan>{{level: <8}}</cyan></bold> <dim>|</dim> {{message}}"
-        ),
-        "SUCCESS": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <bold><green>{{level: <8}}</green></bold> <dim>|</dim> <bold><green>{{message}}</green></bold>"
-        ),
-        "WARNING": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <bold><yellow>{{level: <8}}</yellow></bold> <dim>|</dim> <bold><yellow>{{message}}</yellow></bold>"
-        ),
-        "ERROR": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <bold><red>{{level: <8}}</red></bold> <dim>|</dim> <bold><red>{{message}}</red></bold>"
-        ),
-        "CRITICAL": (
-            f"{{time:{time_format}}} <dim>|</dim>"
-            f" <bold><fg #8B0000><u>{{level: <8}}</u></fg #8B0000></bold>"
-            f" <dim>|</dim> <bold><fg #8B0000>{{message}}</fg #8B0000></bold>"
-        ),
-    }
-
-    def format_record(record: dict[str, Any]) -> str:
-        level_name = record["level"].name
-        if level_name in level_formats:
-            return level_formats[level_name] + "\n{exception}"
-        return (
-            f"{{time:{time_format}}} <dim>|</dim> <bold>{{level: <8}}</bold>"
-            f" <dim>|</dim> {{message}}\n{{exception}}"
-        )
+    codes: list[str] = []
+    for tag in tags:
+        if tag.startswith("fg #"):
+            hex_color = tag[4:]
+            red, green, blue = (int(hex_color[i : i + 2], 16) for i in (0, 2, 4))
+            codes.append(f"38;2;{red};{green};{blue}")
+        else:
+            codes.append(_SGR_CODES[tag])
+    return f"\x1b[{';'.join(codes)}m"
+
+
+# Raw, pre-merged SGR sequences are safe here: loguru only emits a level color where a
+# <level> tag appears in a colorized sink, and strips the tag entirely otherwise.
+_LEVEL_COLORS: dict[str, str] = {
+    "TRACE": _merge_sgr(("dim", "cyan")),
+    "DEBUG": _merge_sgr(("blue",)),
+    "INFO": _merge_sgr(("bold", "cyan")),
+    "SUCCESS": _merge_sgr(("bold", "green")),
+    "WARNING": _merge_sgr(("bold", "yellow")),
+    "ERROR": _merge_sgr(("bold", "red")),
+    "CRITICAL": _merge_sgr(("bold", "fg #8B0000", "underline")),
+}
+"""Console color of the level indicator for each built-in level."""
+
+
+def register_level_colors() -> None:
+    """Register the console colors for the built-in levels with loguru.
+
+    The colors are consumed by the ``<level>`` tags of :func:`create_level_format`.  Loguru
+    resolves them once per handler, so the per-record cost is plain token substitution.
+    """
+    for level_name, color in _LEVEL_COLORS.items():
+        logger.level(level_name, color=color)
 
-    return format_record
+
+def create_level_format(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -> str:
+    """Create the static format string for console output with level-based colors.
+
+    The returned template is parsed by loguru once when the sink is added, instead of a
+    Python callback being invoked for every record.  Loguru appends the line terminator and
+    ``{exception}`` to static formats itself.  Only the level indicator takes the color
+    registered by :func:`register_level_colors`; the timestamp and message body are left
+    uncolored at every level.  Unlike the earlier per-level callback, SUCCESS, WARNING,
+    ERROR and CRITICAL bodies are no longer bold-colored and TRACE bodies are no longer
+    dimmed: a static template can only color a region with the level's own color, which
+    INFO and DEBUG bodies must not take.
+
+    Args:
+        time_format: Loguru time format string.  Defaults to millisecond precision.
+    """
+    return (
+        f"{{time:{time_format}}} <dim>|</dim> <level>{{level: <8}}</level>"
+        f" <dim>|</dim> {{message}}"
+    )
 
 
-def create_plain_format_function(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -> Callable[[dict[str, Any]], str]:
-    """Create a plain-text format function for file output.
+def create_plain_format(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -> str:
+    """Create the plain-text format string for file output.
 
     Identical layout to the console format but contains no ANSI escape codes,
     no loguru color tags, and includes the source location
     (``module:function:line``) as a fourth field.  This makes log files
     readable in any text editor or ``grep`` without stray color characters.
 
+    Like :func:`create_level_format` this is a static template, so no Python callback
+    runs per record; loguru appends the line terminator and ``{exception}`` itself.
+
     Format::
 
         2026-06-19 10:30:00.123 | INFO     | some.module:my_func:42 | message text
@@ -89,12 +123,73 @@ def create_plain_format_function(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -
     Args:
         time_format: Loguru time format string.  Defaults to millisecond precision.
     """
-    fmt = f"{{time:{time_format}}} | {{level: <8}} | {{name}}:{{function}}:{{line}} | {{message}}\n{{exception}}"
+    return f"{{time:{time_format}}} | {{level: <8}} | {{name}}:{{function}}:{{line}} | {{message}}"
+
+
+_console_colorized = False
+"""Whether the console sink added by :func:`configure_logger_format` renders colors."""
+
+_MARKUP_TAG_RE = re.compile(r"(?<!\\)</?(?:[a-z]+|[fb]g #[0-9a-fA-F]{3,6})?>")
+"""Matches the loguru color tags used in worker messages (e.g. ``<b>``, ``<fg #00d7ff>``, ``</>``)."""
+
+
+def console_colorized() -> bool:
+    """Return whether the console sink added by :func:`configure_logger_format` renders colors."""
+    return _console_colorized
+
+
+def strip_markup(message: str) -> str:
+    """Remove loguru color markup from a message, unescaping ``\\<`` to ``<``.
+
+    Use this to log a message built with color tags as plain text, without routing it
+    through loguru's ``opt(colors=True)`` markup parser.
+    """
+    return _MARKUP_TAG_RE.sub("", message).replace("\\<", "<")
+
+
+def _logfmt_quote(value: str) -> str:
+    """Return ``value`` as a double-quoted logfmt value, escaping backslashes, quotes and line breaks."""
+    escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
+    return f'"{escaped}"'
+
+
+def create_logfmt_format(time_format: str = "YYYY-MM-DD HH:mm:ss.SSS") -> Callable[[dict[str, Any]], str]:
+    """Create the logfmt format used for console output that is not a terminal.
+
+    No color markup is emitted, which keeps escape sequences out of piped output and
+    makes the lines cheaper for log collectors to ingest.  The timestamp and message are
+    double-quoted, with quotes, backslashes and line breaks escaped, so messages with
+    spaces or ``=`` and multi-line records such as the status banner stay one parseable
+    line.  The quoted message is stored in ``record["extra"]["logfmt_msg"]`` by the
+    returned format callable, so the quoting only runs for this sink.  A traceback, if
+    any, still follows the line unquoted.
+
+    Args:
+        time_format: Loguru time format string.  Defaults to millisecond precision.
+    """
+    template = f'time="{{time:{time_format}}}" level={{level}} msg={{extra[logfmt_msg]}}\n{{exception}}'
+
+    def _format(record: dict[str, Any]) -> str:
+        # record["message"] is already stripped of markup for opt(colors=True) records
+        record["extra"]["logfmt_msg"] = _logfmt_quote(record["message"])
+        return template
+
+    return _format
 
-    def format_record(_record: dict[str, Any]) -> str:
-        return fmt
 
-    return format_record
+def _stderr_is_tty() -> bool:
+    """Return whether the process's real stderr is attached to a terminal.
+
+    ``sys.__stderr__`` is checked rather than ``sys.stderr``, which the worker replaces
+    with a ``LogConsoleRewriter`` that never reports itself as a TTY.
+    """
+    stream = sys.__stderr__
+    if stream is None:
+        return False
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError):
+        return False
 
 
 _LOGS_DIR = Path("logs")
@@ -112,6 +207,197 @@ _TRACE_RETENTION = "7 days"
 _CRASH_RETENTION = "30 days"
 _CRASH_ROTATION = "00:00"
 
+_VALID_LEVELS = frozenset({"TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"})
+"""Level names accepted by ``AIWORKER_LOG_LEVEL``."""
+_DEBUG_FLAG_VALUES = frozenset({"1", "true", "yes"})
+"""Values of the legacy ``AIWORKER_DEBUG`` flag that force DEBUG level."""
+
+_STARTUP_BANNER_RULE = "=" * 60
+"""Rule framing the main-process startup banner."""
+
+
+def _resolve_log_level() -> str:
+    """Return the log level selected by ``AIWORKER_LOG_LEVEL`` / ``AIWORKER_DEBUG``.
+
+    The environment is read on each call rather than at import, because the worker loads
+    ``bridgeData`` environment overrides after this module has been imported.
+    """
+    log_level = os.getenv("AIWORKER_LOG_LEVEL", "INFO").upper()
+    if log_level not in _VALID_LEVELS:
+        print(f"Warning: Invalid AIWORKER_LOG_LEVEL '{log_level}', defaulting to INFO")
+        log_level = "INFO"
+
+    if os.getenv("AIWORKER_DEBUG", "").lower() in _DEBUG_FLAG_VALUES:
+        log_level = "DEBUG"
+
+    return log_level
+
+
+_CONSOLE_BUFFER_SIZE = 65536
+"""Number of buffered characters at which the console sink writes out immediately."""
+_CONSOLE_FLUSH_INTERVAL = 0.1
+"""Maximum time in seconds a buffered console line waits before being written out."""
+
+
+class _BufferedConsoleSink:
+    """Loguru sink that batches console output into few large ``write()`` syscalls.
+
+    Formatted records are collected as text and written to the stream's binary buffer in
+    one encoded chunk, bypassing the ``TextIOWrapper`` (its per-write encoding and locking)
+    and the flush loguru performs after every line.  The buffer is written out once it
+    holds ``buffer_size`` characters, immediately for records at or above
+    ``flush_level_no`` so problems are never delayed, and otherwise at most
+    ``flush_interval`` seconds after the first record was buffered.  If given, ``rewrite``
+    is applied to each formatted record before it is buffered.
+
+    The interval flush is done by one long-lived daemon thread, started with the first
+    buffered record, which sleeps on a condition until a flush deadline is set.  Call
+    :meth:`close` to write out the buffer and stop it.
+    """
+
+    def __init__(
+        self,
+        stream: TextIO,
+        *,
+        flush_level_no: int,
+        buffer_size: int = _CONSOLE_BUFFER_SIZE,
+        flush_interval: float = _CONSOLE_FLUSH_INTERVAL,
+        rewrite: Callable[[str], str] | None = None,
+    ) -> None:
+        self._encoding = stream.encoding or "utf-8"
+        self._errors = stream.errors or "backslashreplace"
+        self._raw = stream.buffer
+        self._rewrite = rewrite
+        self._pending: list[str] = []
+        self._pending_size = 0
+        self._buffer_size = buffer_size
+        self._flush_level_no = flush_level_no
+        self._flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._flush_deadline: float | None = None
+        self._flusher: threading.Thread | None = None
+        self._closed = False
+
+    def __call__(self, message: Any) -> None:
+        text = str(message)
+        with self._lock:
+            if self._rewrite is not None:
+                text = self._rewrite(text)
+            self._pending.append(text)
+            self._pending_size += len(text)
+            if (
+                self._closed
+                or message.record["level"].no >= self._flush_level_no
+                or self._pending_size >= self._buffer_size
+            ):
+                self._flush_locked()
+            elif self._flush_deadline is None:
+                self._flush_deadline = time.monotonic() + self._flush_interval
+                if self._flusher is None:
+                    self._flusher = threading.Thread(target=self._run_flusher, name="console-flush", daemon=True)
+                    self._flusher.start()
+                else:
+                    self._wakeup.notify()
+
+    def flush(self) -> None:
+        """Write out any buffered output."""
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        """Write out any buffered output and stop the flusher thread.
+
+        Records arriving after this are written out immediately.
+        """
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+            self._wakeup.notify()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join()
+
+    def _run_flusher(self) -> None:
+        with self._lock:
+            while not self._closed:
+                if self._flush_deadline is None:
+                    self._wakeup.wait()
+                    continue
+                remaining = self._flush_deadline - time.monotonic()
+                if remaining > 0:
+                    self._wakeup.wait(remaining)
+                else:
+                    self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        self._flush_deadline = None
+        if not self._pending:
+            return
+        data = "".join(self._pending).encode(self._encoding, self._errors)
+        self._pending.clear()
+        self._pending_size = 0
+        try:
+            self._raw.write(data)
+            self._raw.flush()
+        except (OSError, ValueError):
+            # The underlying stream was closed (e.g. during interpreter shutdown).
+            pass
+
+
+def _make_console_sink(warn_level_no: int) -> Any:
+    """Return the stderr sink for the console handler.
+
+    A :class:`_BufferedConsoleSink` is used where possible.  When stderr is the worker's
+    ``LogConsoleRewriter`` (an ``io.StringIO`` without a binary buffer), the sink buffers in
+    front of it: each record goes through the rewriter's ``rewrite()`` and is written to the
+    stream it wraps.  On Windows, or when stderr has been replaced by any other object without
+    a binary buffer, ``sys.stderr`` itself is returned so loguru can enable VT processing (or
+    colorama conversion) for the stream as usual.
+    """
+    stream = sys.stderr
+    rewrite = None
+    original_iostream = getattr(stream, "original_iostream", None)
+    if original_iostream is not None and callable(getattr(stream, "rewrite", None)):
+        rewrite = stream.rewrite
+        stream = original_iostream
+    if os.name == "nt" or not hasattr(stream, "buffer"):
+        return sys.stderr
+    return _BufferedConsoleSink(stream, flush_level_no=warn_level_no, rewrite=rewrite)
+
+
+_console_sink: _BufferedConsoleSink | None = None
+"""The buffered sink of the current console handler, closed when it is replaced and at exit."""
+
+_exit_drain_registered = False
+
+
+def _close_console_sink() -> None:
+    """Close and forget the current buffered console sink, if any."""
+    global _console_sink
+    if _console_sink is not None:
+        _console_sink.close()
+        _console_sink = None
+
+
+def _drain_console_at_exit() -> None:
+    """Write out all console output still queued or buffered when the interpreter exits.
+
+    ``logger.remove()`` joins loguru's sink thread after it has handed over everything still
+    queued; the buffered console sink is closed afterwards.
+    """
+    logger.remove()
+    _close_console_sink()
+
+
+def _register_exit_drain() -> None:
+    """Register :func:`_drain_console_at_exit` (once per process)."""
+    global _exit_drain_registered
+    if not _exit_drain_registered:
+        atexit.register(_drain_console_at_exit)
+        _exit_drain_registered = True
+
+
 def _make_console_filter(warn_level_no: int) -> Any:
     """Return a loguru filter that limits INFO/DEBUG to our own code on the console.
 
@@ -209,7 +495,11 @@ def configure_logger_format(process_id: int | None = None, *, enable_stderr: boo
         2026-06-19 10:30:00.123 | INFO     | module:function:line | message
 
     Console format uses level-based ANSI colors but is otherwise identical
-    (source location omitted to keep the console concise).
+    (source location omitted to keep the console concise).  When stderr is not a
+    terminal (piped to a file, journald, ``docker logs``) the console instead gets an
+    uncolored logfmt-style line::
+
+        time="2026-06-19 10:30:00.123" level=INFO msg="message text"
 
     Environment variables
     ---------------------
@@ -226,29 +516,40 @@ def configure_logger_format(process_id: int | None = None, *, enable_stderr: boo
         enable_stderr: When ``True`` (default) a stderr console sink is added.
             Pass ``False`` when console logging is disabled (``--no-logging``).
     """
+    global _console_colorized, _console_sink
+
     logger.remove()
+    _close_console_sink()
 
-    log_level = os.getenv("AIWORKER_LOG_LEVEL", "INFO").upper()
-    valid_levels = ["TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL"]
-    if log_level not in valid_levels:
-        print(f"Warning: Invalid AIWORKER_LOG_LEVEL '{log_level}', defaulting to INFO")
-        log_level = "INFO"
+    log_level = _resolve_log_level()
 
-    if os.getenv("AIWORKER_DEBUG", "").lower() in ("1", "true", "yes"):
-        log_level = "DEBUG"
+    register_level_colors()
+    file_format = create_plain_format(time_format="YYYY-MM-DD HH:mm:ss.SSS")
 
-    console_format = create_level_format_function(time_format="YYYY-MM-DD HH:mm:ss.SSS")
-    file_format = create_plain_format_function(time_format="YYYY-MM-DD HH:mm:ss.SSS")
+    console_is_tty = _stderr_is_tty()
+    if console_is_tty:
+        console_format = create_level_format(time_format="YYYY-MM-DD HH:mm:ss.SSS")
+    else:
+        console_format = create_logfmt_format(time_format="YYYY-MM-DD HH:mm:ss.SSS")
 
     if enable_stderr:
         _warn_level_no = logger.level("WARNING").no
+        console_sink = _make_console_sink(_warn_level_no)
+        if isinstance(console_sink, _BufferedConsoleSink):
+            _console_sink = console_sink
+        # enqueue=True hands each record to loguru's background sink thread, so the
+        # calling thread pays for a queue put rather than formatting, colorizing and
+        # writing the line itself.
         logger.add(
-            sys.stderr,
+            console_sink,
             format=console_format,
             level=log_level,
-            colorize=True,
+            colorize=console_is_tty,
             filter=_make_console_filter(_warn_level_no),
+            enqueue=True,
         )
+        _register_exit_drain()
+    _console_colorized = enable_stderr and console_is_tty
 
     # Build per-type sink paths.  The {time:YYYY-MM-DD} token in the date directory
     # component is replaced by loguru when it opens or rotates a file, so each calendar
@@ -349,7 +650,7 @@ def configure_logger_format(process_id: int | None = None, *, enable_stderr: boo
         from datetime import date  # noqa: PLC0415
 
         today_log_dir = (_LOGS_DIR / str(date.today())).resolve()
-        logger.info(f"{'=' * 60}")
+        logger.info(_STARTUP_BANNER_RULE)
         logger.info(f"  Worker main process started (PID={pid})")
         logger.info(f"  Logs root  : {_LOGS_DIR.resolve()}")
         logger.info(f"  Today      : {today_log_dir}")
@@ -357,6 +658,6 @@ def configure_logger_format(process_id: int | None = None, *, enable_stderr: boo
         logger.info(f"    trace/   — ERROR+ with backtraces")
         logger.info(f"    crash/   — CRITICAL only")
         logger.info(f"    webui/   — webui module only")
-        logger.info(f"{'=' * 60}")
+        logger.info(_STARTUP_BANNER_RULE)
     else:
         logger.info(f"--- Subprocess {process_id} started (PID={pid}) ---")
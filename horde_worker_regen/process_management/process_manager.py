@@ -76,7 +76,7 @@ from horde_worker_regen.consts import (
     WEBUI_MODEL_STATE_FILENAME,
     WORKER_RESTART_EXIT_CODE,
 )
-from horde_worker_regen.logger_config import create_level_format_function
+from horde_worker_regen.logger_config import console_colorized, create_level_format, strip_markup
 from horde_worker_regen.process_management._aliased_types import ProcessQueue
 from horde_worker_regen.process_management.horde_process import HordeProcessType
 from horde_worker_regen.process_management.inference_process import HordeInferenceProcess
@@ -115,6 +115,15 @@ BYTES_TO_MEGABYTES = 1024 * 1024
 METRICS_CALCULATION_WINDOW_SECONDS = 3600
 """Rolling time window, in seconds, for calculating rate-based metrics such as kudos per hour and images per hour."""
 
+_STATUS_BANNER_WIDTH = 80
+"""Width, in characters, of the rules drawn around the periodic status banner."""
+_STATUS_RULE_MAJOR = "<fg #00d7ff>" + "=" * _STATUS_BANNER_WIDTH + "</>"
+"""Rule opening and closing the status banner."""
+_STATUS_RULE_MINOR = "<fg #00d7ff>" + "-" * _STATUS_BANNER_WIDTH + "</>"
+"""Rule separating sections within the status banner."""
+_STATUS_RULE_SHUTDOWN = "<red>" + "=" * _STATUS_BANNER_WIDTH + "</>"
+"""Rule framing the shutdown notice in the status banner."""
+
 # CUDA cores per streaming multiprocessor (SM) keyed by (major, minor) compute capability.
 # Sourced from the NVIDIA CUDA Programming Guide and GPU specifications.
 # Unknown compute capabilities default to 0 (no cores reported) to avoid mixing units.
@@ -2311,6 +2320,10 @@ class HordeWorkerProcessManager:
         """Per-image safety flags (is_nsfw, is_csam) for the last preview images."""
         self._console_logs: deque[str] = deque(maxlen=self._MAX_CONSOLE_LOGS_BUFFER)
         """Recent console logs for webui display."""
+        self._console_logs_seq: int = 0
+        """Total console log lines captured, so the webui can send clients only the lines they lack."""
+        self._console_logs_lock = threading.Lock()
+        """Keeps _console_logs and _console_logs_seq in step; the log sink runs on whichever thread logs."""
         self._log_handler_id: int | None = None
         """ID of the logger handler for capturing console logs."""
 
@@ -2346,10 +2359,10 @@ class HordeWorkerProcessManager:
                 logger.info(f"Web UI enabled on port {self.bridge_data.webui_port}")
 
                 # Add a log handler to capture logs for webui with colored output.
-                # Use the same format function and timestamp format as the standard
+                # Use the same format string and timestamp format as the standard
                 # stderr console sink so the webui log display exactly matches the
                 # standard console output (timestamp, level, message, coloring).
-                webui_format_record = create_level_format_function(time_format="YYYY-MM-DD HH:mm:ss.SSS")
+                webui_format_record = create_level_format(time_format="YYYY-MM-DD HH:mm:ss.SSS")
 
                 self._log_handler_id = logger.add(
                     self._capture_log_for_webui,
@@ -2375,7 +2388,9 @@ class HordeWorkerProcessManager:
 
         if clean_message:
             # Store the original message with ANSI codes for colored display in webui
-            self._console_logs.append(message.strip())
+            with self._console_logs_lock:
+                self._console_logs.append(message.strip())
+                self._console_logs_seq += 1
 
             # Also capture ERROR and CRITICAL level messages into errors_history
             log_record = getattr(message, "record", None)
@@ -7936,7 +7951,13 @@ class HordeWorkerProcessManager:
             self._in_deadlock = False
 
     def print_status_method(self) -> None:
-        """Print the status of the worker if it's time to do so."""
+        """Print the status of the worker if it's time to do so.
+
+        Consecutive banner lines are collected in a list and emitted with a single logging
+        call, so a refresh normally costs two passes through loguru's pipeline (the banner body
+        and its closing rule) rather than one per line.  Warnings are still logged as records
+        of their own, in the same place within the banner as before.
+        """
         if self._last_pop_maintenance_mode:
             return
 
@@ -7944,18 +7965,28 @@ class HordeWorkerProcessManager:
         if cur_time - self._last_status_message_time > self._status_message_frequency:
             AIWORKER_LIMITED_CONSOLE_MESSAGES = os.getenv("AIWORKER_LIMITED_CONSOLE_MESSAGES", False)
 
-            logging_function = logger.opt(colors=True).info
-
-            if AIWORKER_LIMITED_CONSOLE_MESSAGES:
-                logging_function = logger.opt(colors=True).success
+            status_level = "SUCCESS" if AIWORKER_LIMITED_CONSOLE_MESSAGES else "INFO"
 
             process_info_strings = self._process_map.get_process_info_strings()
 
-            logging_function("<fg #00d7ff>" + "=" * 80 + "</>")
+            status_lines: list[str] = [_STATUS_RULE_MAJOR]
+
+            def emit_status_lines() -> None:
+                """Log the banner lines collected so far as one record."""
+                if not status_lines:
+                    return
+                status_block = "\n".join(status_lines)
+                status_lines.clear()
+                if self.webui is None and not console_colorized():
+                    # No sink renders colors (console disabled, no web UI): strip the markup once
+                    # here instead of having loguru's markup parser run over the whole block.
+                    logger.log(status_level, strip_markup(status_block))
+                else:
+                    logger.opt(colors=True).log(status_level, status_block)
 
             self._prune_api_messages()
             if len(self._api_messages_received) > 0:
-                logging_function("<b><fg #ffd700>API Messages:</></b>")
+                status_lines.append("<b><fg #ffd700>API Messages:</></b>")
                 for message_id, message in self._api_messages_received.items():
                     try:
                         message_text = message.message_text or ""
@@ -7963,34 +7994,28 @@ class HordeWorkerProcessManager:
                         log_safe_message = log_safe_message.replace("\n", " ")
                         log_safe_message = log_safe_message.replace("\r", " ")
                         log_safe_message = log_safe_message.replace("\t", " ")
-                        log_safe_message = log_safe_message.replace("{", "{{").replace("}", "}}")
                         log_safe_message = log_safe_message.replace('"', "'")
-                        log_safe_message = log_safe_message.replace("'", "'")
 
-                        logging_function(
+                        status_lines.append(
                             f"  <fg #000><bg #0ff127>{log_safe_message} "
                             f"(from {message.message_origin}, expires {message.message_expiry}, "
                             f"message_id: {message_id[:8]})</></>",
-                            "</></>",
                         )
                     except Exception as e:
                         logger.warning(f"Failed to print API message: {e}")
 
             # Only show detailed process info if not in limited console mode
             if not AIWORKER_LIMITED_CONSOLE_MESSAGES:
-                logging_function("<b><fg #00d7ff>Processes:</></b>")
-                for process_info_string in process_info_strings:
-                    logging_function("  " + process_info_string)
-
-                logging_function("<fg #00d7ff>" + "-" * 80 + "</>")
+                status_lines.append("<b><fg #00d7ff>Processes:</></b>")
+                status_lines.extend("  " + process_info_string for process_info_string in process_info_strings)
             else:
                 # In limited mode, just show a brief summary
                 num_busy = self._process_map.num_busy_processes()
                 num_total = len(self._process_map)
-                logging_function(f"<b><fg #00d7ff>Processes:</></b> {num_busy}/{num_total} busy")
-                logging_function("<fg #00d7ff>" + "-" * 80 + "</>")
+                status_lines.append(f"<b><fg #00d7ff>Processes:</></b> {num_busy}/{num_total} busy")
+            status_lines.append(_STATUS_RULE_MINOR)
 
-            logging_function("<b><fg #00ff87>Jobs:</></b>")
+            status_lines.append("<b><fg #00ff87>Jobs:</></b>")
 
             # Show jobs in progress
             jobs_in_progress_list = []
@@ -8000,7 +8025,7 @@ class HordeWorkerProcessManager:
                 jobs_in_progress_list.append(f"[{shortened_id}: <u>{safe_model}</u>]")
 
             if jobs_in_progress_list:
-                logging_function(f'  In Progress: {", ".join(jobs_in_progress_list)}')
+                status_lines.append(f'  In Progress: {", ".join(jobs_in_progress_list)}')
 
             # Show queued jobs (exclude jobs already in progress)
             jobs_pending_list = []
@@ -8012,10 +8037,10 @@ class HordeWorkerProcessManager:
                 jobs_pending_list.append(f"[{shortened_id}: <u>{safe_model}</u>]")
 
             if jobs_pending_list:
-                logging_function(f'  Queued: {", ".join(jobs_pending_list)}')
+                status_lines.append(f'  Queued: {", ".join(jobs_pending_list)}')
 
             if not jobs_in_progress_list and not jobs_pending_list:
-                logging_function("  No active jobs")
+                status_lines.append("  No active jobs")
 
             # Warn when inference processes have been idle in WAITING_FOR_JOB for a suspiciously long time
             # and the worker is not simply waiting because no jobs are available.
@@ -8034,6 +8059,7 @@ class HordeWorkerProcessManager:
                             f"Process {pid}: {cur_time - pinfo.last_heartbeat_timestamp:.0f}s"
                             for pid, pinfo in idle_inference_processes
                         )
+                        emit_status_lines()
                         logger.warning(
                             f"Inference process(es) have been idle in WAITING_FOR_JOB for over "
                             f"{_idle_warn_threshold}s with no active jobs dispatched: {idle_deltas}. "
@@ -8046,13 +8072,16 @@ class HordeWorkerProcessManager:
             else:
                 self._idle_process_warning_logged = False
 
-            active_models = {
-                process.loaded_horde_model_name
-                for process in self._process_map.values()
-                if process.loaded_horde_model_name is not None
-            }
-
-            logger.debug(f"Active models: {active_models}")
+            # The debug details below are built lazily: loguru only calls the lambdas when a
+            # sink accepts DEBUG, so the default INFO level skips this work entirely.
+            logger.opt(lazy=True).debug(
+                "Active models: {}",
+                lambda: {
+                    process.loaded_horde_model_name
+                    for process in self._process_map.values()
+                    if process.loaded_horde_model_name is not None
+                },
+            )
 
             _no_jobs_time = self._time_spent_no_jobs_available
             if self._last_pop_no_jobs_available_time > 0:
@@ -8072,31 +8101,30 @@ class HordeWorkerProcessManager:
                 ],
             )
 
-            logging_function(
-                f"<fg #00ff87>{job_info_message}</>",
-            )
+            status_lines.append(f"<fg #00ff87>{job_info_message}</>")
 
             # Print failing models periodically
             if (
                 self._failed_models
                 and cur_time - self._last_failed_models_print_time > self.FAILED_MODELS_REPORT_INTERVAL_SECONDS
             ):
-                logging_function("<fg #00d7ff>" + "-" * 80 + "</>")
-                logging_function("<b><fg #ff5f5f>Failing Models:</></b>")
+                status_lines.append(_STATUS_RULE_MINOR)
+                status_lines.append("<b><fg #ff5f5f>Failing Models:</></b>")
                 # Sort by failure count descending
                 sorted_failures = sorted(self._failed_models.items(), key=lambda x: x[1], reverse=True)
                 for model_name, count in sorted_failures[: self.MAX_FAILING_MODELS_TO_DISPLAY]:
-                    logging_function(f"  <fg #ff6b6b>{model_name}: {count} failures</>")
+                    safe_model_name = model_name.replace("<", "\\<")
+                    status_lines.append(f"  <fg #ff6b6b>{safe_model_name}: {count} failures</>")
                 self._last_failed_models_print_time = cur_time
 
-            logging_function("<fg #00d7ff>" + "-" * 80 + "</>")
+            status_lines.append(_STATUS_RULE_MINOR)
 
             # Only show worker config periodically (not every status update)
             if (
                 not AIWORKER_LIMITED_CONSOLE_MESSAGES
                 and cur_time - self._last_worker_config_print_time > self.WORKER_CONFIG_REPORT_INTERVAL_SECONDS
             ):
-                logging_function("<b><fg #5fd7ff>Worker Config:</></b>")
+                status_lines.append("<b><fg #5fd7ff>Worker Config:</></b>")
 
                 max_power_dimension = int(math.sqrt(self.bridge_data.max_power * 8 * 64 * 64))
                 worker_info = " | ".join(
@@ -8118,7 +8146,7 @@ class HordeWorkerProcessManager:
                         f"pp_overlap: {self.bridge_data.post_process_job_overlap}",
                     ],
                 )
-                logger.info(f"  {worker_info}")
+                status_lines.append("  " + worker_info.replace("<", "\\<"))
 
                 memory_info = " | ".join(
                     [
@@ -8128,12 +8156,15 @@ class HordeWorkerProcessManager:
                         f"high_mem: {self.bridge_data.high_memory_mode}",
                     ],
                 )
-                logger.info(f"  {memory_info}")
+                status_lines.append(f"  {memory_info}")
 
                 self._last_worker_config_print_time = cur_time
 
-            logger.debug(
-                " | ".join(
+            emit_status_lines()
+
+            logger.opt(lazy=True).debug(
+                "{}",
+                lambda: " | ".join(
                     [
                         f"preload_timeout: {self.bridge_data.preload_timeout}",
                         f"download_timeout: {self.bridge_data.download_timeout}",
@@ -8223,13 +8254,15 @@ class HordeWorkerProcessManager:
                     )
 
             if self._shutting_down:
-                logger.opt(colors=True).warning("<red>" + "=" * 80 + "</>")
+                logger.opt(colors=True).warning(_STATUS_RULE_SHUTDOWN)
                 logger.opt(colors=True).warning("<red>SHUTTING DOWN - Finishing current jobs...</>")
-                logger.opt(colors=True).warning("<red>" + "=" * 80 + "</>")
+                logger.opt(colors=True).warning(_STATUS_RULE_SHUTDOWN)
                 self._status_message_frequency = 5.0
 
+            status_lines.append(_STATUS_RULE_MAJOR)
+            emit_status_lines()
+
             self._last_status_message_time = cur_time
-            logging_function("<fg #00d7ff>" + "=" * 80 + "</>")
 
     _bridge_data_loop_interval = 1.0
     """The interval between bridge data loop iterations."""
@@ -8996,6 +9029,10 @@ class HordeWorkerProcessManager:
                 self._inference_scale_down_requested = True
                 logger.debug(f"Auto max active models updated to {auto_ma}")
 
+        with self._console_logs_lock:
+            console_logs = list(self._console_logs)[-self._WEBUI_CONSOLE_LOGS_LIMIT :]
+            console_logs_seq = self._console_logs_seq
+
         self.webui.update_status(
             worker_name=self.bridge_data.dreamer_worker_name,
             horde_username=horde_username,
@@ -9034,7 +9071,8 @@ class HordeWorkerProcessManager:
             last_image_submission_timestamp=self._last_image_job_timestamp,
             last_image_model=self._last_image_model,
             last_image_safety=self._last_image_safety,
-            console_logs=list(self._console_logs)[-self._WEBUI_CONSOLE_LOGS_LIMIT:] if self._console_logs else [],
+            console_logs=console_logs,
+            console_logs_seq=console_logs_seq,
             faulted_jobs_history=self._faulted_jobs_history,
             errors_history=(
                 list(self._errors_history)
@@ -1,11 +1,17 @@
 """Contains the classes to form a safety process, which is responsible for evaluating the safety of images."""
 
-import base64
 import enum
+import gc
+import hashlib
 import json
+import math
 import os
+import struct
 import time
 import warnings
+import zlib
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from enum import auto
 from io import BytesIO
@@ -20,6 +26,13 @@ except (ImportError, AttributeError):
 # ! IMPORTANT: End of own code
 from multiprocessing.synchronize import Lock
 
+try:
+    # SIMD accelerated, drop-in replacement for the standard library functions
+    from pybase64 import b64decode, b64encode
+except ImportError:
+    from base64 import b64decode, b64encode
+
+from horde_sdk.ai_horde_api.fields import JobID
 from loguru import logger
 from PIL import Image, PngImagePlugin
 from typing_extensions import override
@@ -40,6 +53,7 @@ from horde_worker_regen.process_management.messages import (
 )
 
 if TYPE_CHECKING:
+    import torch
     from horde_safety.deep_danbooru_model import DeepDanbooruModel
     from horde_safety.interrogate import Interrogator
     from horde_safety.nsfw_checker_class import NSFWChecker, NSFWResult
@@ -58,6 +72,189 @@ else:
         """Dummy class to prevent type errors."""
 
 
+_PNG_COMPRESS_LEVEL = 1
+"""zlib level for the PNGs saved to the output directory. Level 1 deflates several times faster than Pillow's
+default of 6 for files that are typically only 10-20% larger."""
+
+_SAFETY_PRECISIONS = frozenset({"fp16", "fp32"})
+"""The accepted values for `AIWORKER_SAFETY_PRECISION`."""
+
+_NSFW_RESULT_CACHE_SIZE = 256
+"""How many recent NSFW verdicts are kept for byte-identical resubmissions of an image."""
+
+_DEFAULT_SAFETY_BATCH_SIZE = 8
+"""How many images share one CLIP forward pass unless `AIWORKER_SAFETY_BATCH_SIZE` says otherwise."""
+
+
+def _decode_image_base64(image_base64: str) -> tuple[Image.Image | None, bytes]:
+    """Decode a base64 encoded image fully into memory.
+
+    Returns:
+        tuple[Image.Image | None, bytes]: The loaded image, or `None` if the image data is corrupted, and the
+        encoded image bytes.
+    """
+    encoded_image = b64decode(image_base64)
+    image_bytes = BytesIO(encoded_image)
+    try:
+        image = Image.open(image_bytes)
+        # Force a full load into memory so the image no longer depends on image_bytes.
+        image.load()
+    except (OSError, ValueError) as e:
+        logger.error(f"Failed to open image: {type(e).__name__} {e}")
+        return None, encoded_image
+    finally:
+        image_bytes.close()
+
+    return image, encoded_image
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _find_first_idat_offset(encoded_image: bytes) -> int | None:
+    """Return the offset of the first IDAT chunk of an encoded PNG, or `None` if it is not a well formed PNG."""
+    if not encoded_image.startswith(_PNG_SIGNATURE):
+        return None
+
+    offset = len(_PNG_SIGNATURE)
+    while offset + 8 <= len(encoded_image):
+        (length,) = struct.unpack_from(">I", encoded_image, offset)
+        if encoded_image[offset + 4 : offset + 8] == b"IDAT":
+            return offset
+        # length, type, data and CRC
+        offset += 12 + length
+
+    return None
+
+
+def _encode_png_chunks(chunks: list[tuple[bytes, bytes, bool]]) -> bytes:
+    """Serialise `PngInfo.chunks` (type, data, after_idat) into raw PNG chunks."""
+    return b"".join(
+        struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", zlib.crc32(chunk_type + data))
+        for chunk_type, data, *_ in chunks
+    )
+
+
+def _build_shared_pnginfo_chunks(message: HordeSafetyControlMessage, created_at: str) -> list[tuple[str, str]]:
+    """Render the PNG text chunks shared by every image of a job.
+
+    Args:
+        message (HordeSafetyControlMessage): The job's safety control message.
+        created_at (str): The ISO timestamp to record as the creation time.
+
+    Returns:
+        list[tuple[str, str]]: The (key, value) pairs to add to each image's `PngInfo`. If the generation metadata
+        cannot be rendered the chunks collected so far are returned.
+    """
+    chunks: list[tuple[str, str]] = []
+
+    def _add_metadata_text(key: str, value: object) -> None:
+        if value is None:
+            # Omit unknown fields rather than embedding empty chunks
+            return
+        if isinstance(value, str):
+            chunks.append((key, value))
+        elif type(value) is int or (type(value) is float and math.isfinite(value)):
+            # Seeds, steps and scales: repr() is exactly what json.dumps would write for these
+            chunks.append((key, repr(value)))
+        else:
+            chunks.append((key, json.dumps(value, ensure_ascii=False, default=str)))
+
+    try:
+        original_prompt = message.prompt
+        if "###" in original_prompt:
+            # Split the text at "###"
+            parts = original_prompt.split("###")
+
+            # Get the string before and after "###"
+            positive_prompt = parts[0]
+            negative_prompt = parts[1]
+        else:
+            positive_prompt = original_prompt
+            negative_prompt = ""
+
+        generation_metadata = message.generation_metadata or {}
+        sanitized_negative_prompt = generation_metadata.get("sanitized_negative_prompt")
+
+        # Add custom metadata
+        chunks.append(("Positive prompt", positive_prompt))
+        chunks.append(
+            (
+                "Negative prompt",
+                sanitized_negative_prompt if sanitized_negative_prompt is not None else negative_prompt,
+            ),
+        )
+        chunks.append(("Created at", created_at))
+
+        # Explicitly add key fields when available
+        _add_metadata_text("Model name", generation_metadata.get("model"))
+        _add_metadata_text("Model hash", generation_metadata.get("model_hash"))
+        _add_metadata_text("Sampler", generation_metadata.get("sampler_name"))
+        _add_metadata_text("Seed", generation_metadata.get("seed"))
+        _add_metadata_text("Seed resize from", generation_metadata.get("seed_resize_from"))
+        _add_metadata_text("Seed resize from width", generation_metadata.get("seed_resize_from_width"))
+        _add_metadata_text("Seed resize from height", generation_metadata.get("seed_resize_from_height"))
+        _add_metadata_text("CFG scale", generation_metadata.get("cfg_scale"))
+        _add_metadata_text("Denoising strength", generation_metadata.get("denoising_strength"))
+        _add_metadata_text(
+            "Steps",
+            (
+                generation_metadata.get("steps")
+                if generation_metadata.get("steps") is not None
+                else generation_metadata.get("ddim_steps")
+            ),
+        )
+        _add_metadata_text("Version", generation_metadata.get("version"))
+        post_processing = generation_metadata.get("post_processing")
+        if isinstance(post_processing, list):
+            _add_metadata_text("Post processing", ", ".join(str(v) for v in post_processing))
+        else:
+            _add_metadata_text("Post processing", post_processing)
+
+        lora_descriptions = generation_metadata.get("lora_descriptions") or []
+        if isinstance(lora_descriptions, list) and lora_descriptions:
+            lora_text = ", ".join(lora_descriptions)
+        else:
+            lora_text = ""
+        chunks.append(("Loras", lora_text))
+
+        lora_hashes = generation_metadata.get("lora_hashes")
+        if lora_hashes is None:
+            try:
+                lora_hash_list: list[str] = []
+                loras = generation_metadata.get("loras") or []
+                for lora in loras:
+                    if isinstance(lora, dict):
+                        lora_hash = lora.get("hash") or lora.get("lora_hash") or lora.get("sha")
+                    else:
+                        lora_hash = (
+                            getattr(lora, "hash", None)
+                            or getattr(lora, "lora_hash", None)
+                            or getattr(lora, "sha", None)
+                        )
+                    if lora_hash is not None:
+                        lora_hash_list.append(str(lora_hash))
+                lora_hashes = lora_hash_list
+            except (AttributeError, KeyError, TypeError) as e:
+                # Handle cases where lora object doesn't have expected attributes
+                logger.debug(f"Failed to extract lora hash: {e}")
+                lora_hashes = None
+
+        if isinstance(lora_hashes, list):
+            _add_metadata_text("LoRA hashes", ", ".join(str(v) for v in lora_hashes))
+        else:
+            _add_metadata_text("LoRA hashes", lora_hashes)
+
+        if "karras" in generation_metadata and "schedule_type" not in generation_metadata:
+            schedule_type = "karras" if generation_metadata.get("karras") else "native"
+            _add_metadata_text("Schedule type", schedule_type)
+    except (KeyError, ValueError, TypeError) as e:
+        # Handle metadata extraction errors, but continue with image processing
+        logger.error(f"Failed to add metadata: {e}")
+
+    return chunks
+
+
 class CensorReason(enum.Enum):
     """The reason for censoring an image."""
 
@@ -75,10 +272,33 @@ class HordeSafetyProcess(HordeProcess):
 
     _nsfw_checker: NSFWChecker
 
-    censor_csam_image_base64: str
-    censor_censorlist_image_base64: str
-    censor_sfw_request_image_base64: str
-    censor_sfw_worker_image_base64: str
+    _io_pool: ThreadPoolExecutor
+    """Decodes the images of a job and encodes the saved PNGs off the inference path."""
+
+    _nsfw_result_cache: "OrderedDict[bytes, NSFWResult]"
+    """Recent verdicts keyed by a digest of the encoded image, prompt and model info, least recently used first."""
+
+    _batch_size: int = _DEFAULT_SAFETY_BATCH_SIZE
+    """The most images encoded in one CLIP forward pass. Set with `AIWORKER_SAFETY_BATCH_SIZE`."""
+
+    _last_memory_report_time: float = 0.0
+    """When the last per-job memory report was sent."""
+
+    _save_outputs: bool = True
+    """Whether every checked image is archived as a PNG. Disabled with `AIWORKER_SAVE_OUTPUTS=0`."""
+    _output_base_directory: str = "/output"
+    """The root of the dated output tree. Set with `AIWORKER_OUTPUT_DIR`."""
+
+    _embed_metadata: bool = True
+    """Whether generation metadata is embedded in saved PNGs. Disabled with `AIWORKER_EMBED_METADATA=0`."""
+
+    _cached_output_date: str | None = None
+    """The `YYYY-MM-DD` date `_cached_output_dir` was created for."""
+    _cached_output_dir: str | None = None
+    """The dated output directory, created once per day rather than once per job."""
+
+    _censor_images_base64: dict[CensorReason, str]
+    """The base64 encoded replacement image for each censor reason."""
 
     def __init__(
         self,
@@ -125,6 +345,15 @@ class HordeSafetyProcess(HordeProcess):
             logger.error(f"Failed to initialise horde_safety: {type(e).__name__} {e}")
             raise
 
+        self._disable_autograd()
+
+        if not cpu_only:
+            self._configure_gpu_precision()
+        else:
+            self._configure_cpu_threads()
+            if os.getenv("AIWORKER_SAFETY_INT8", "0").lower() in ("1", "true", "yes"):
+                self._quantize_for_cpu()
+
         try:
             from horde_safety.nsfw_checker_class import NSFWChecker
 
@@ -136,12 +365,26 @@ class HordeSafetyProcess(HordeProcess):
             logger.error(f"Failed to initialise NSFWChecker: {type(e).__name__} {e}")
             raise
 
+        self._io_pool = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        self._nsfw_result_cache = OrderedDict()
+        self._save_outputs = os.getenv("AIWORKER_SAVE_OUTPUTS", "1").lower() not in ("0", "false", "no")
+        self._output_base_directory = os.getenv("AIWORKER_OUTPUT_DIR") or "/output"
+        self._embed_metadata = os.getenv("AIWORKER_EMBED_METADATA", "1").lower() not in ("0", "false", "no")
+        self._batch_size = self._get_batch_size()
+
         try:
             self.load_censor_files()
         except Exception as e:
             logger.error(f"Failed to load censor files: {type(e).__name__} {e}")
             raise
 
+        self._warm_up_models()
+
+        # The models and censor images live for the whole process. Moving them to the permanent generation keeps
+        # the collector from re-traversing them in every full collection triggered by per-job allocations.
+        gc.collect()
+        gc.freeze()
+
         info_message = "Horde safety process started."
 
         logger.info(info_message)
@@ -150,21 +393,148 @@ class HordeSafetyProcess(HordeProcess):
             info=info_message,
         )
 
-        logger.info(
-            "The first job will always take several seconds longer when on CPU. Subsequent jobs will be faster.",
-        )
+    def _disable_autograd(self) -> None:
+        """Turn off autograd for the safety process, which only ever runs inference.
 
-    def _set_censor_image(self, reason: CensorReason, image_base64: str) -> None:
-        if reason == CensorReason.CSAM:
-            self.censor_csam_image_base64 = image_base64
-        elif reason == CensorReason.CENSORLIST:
-            self.censor_censorlist_image_base64 = image_base64
-        elif reason == CensorReason.SFW_REQUEST:
-            self.censor_sfw_request_image_base64 = image_base64
-        elif reason == CensorReason.SFW_WORKER:
-            self.censor_sfw_worker_image_base64 = image_base64
-        else:
-            raise ValueError(f"Unknown censor reason: {reason}")
+        horde_safety wraps its forwards in `torch.no_grad()`; disabling grad for the whole process also covers the
+        tensor preparation around them. Grad mode is thread-local, but every torch call in this process is made from
+        the main thread.
+        """
+        try:
+            import torch
+
+            torch.set_grad_enabled(False)
+            self._deep_danbooru_model.requires_grad_(False).eval()
+            self._interrogator.clip_model.requires_grad_(False).eval()
+        except Exception as e:
+            logger.warning(f"Failed to disable autograd for the safety models: {type(e).__name__} {e}")
+
+    def _configure_gpu_precision(self) -> None:
+        """Store the safety model weights in half precision and allow TF32 matmuls.
+
+        horde_safety already runs both models under fp16 autocast on CUDA, so keeping fp32 weights only costs VRAM
+        and a cast on every forward. Set `AIWORKER_SAFETY_PRECISION=fp32` to keep the full precision weights.
+        """
+        precision = os.getenv("AIWORKER_SAFETY_PRECISION", "fp16").lower()
+        if precision not in _SAFETY_PRECISIONS:
+            logger.warning(
+                f"Invalid AIWORKER_SAFETY_PRECISION '{precision}', using fp16. "
+                f"Valid values: {', '.join(sorted(_SAFETY_PRECISIONS))}",
+            )
+            precision = "fp16"
+
+        if precision == "fp32":
+            return
+
+        try:
+            import torch
+
+            torch.set_float32_matmul_precision("high")
+            self._deep_danbooru_model.half()
+            self._interrogator.clip_model.half()
+        except Exception as e:
+            logger.warning(f"Failed to switch the safety models to fp16: {type(e).__name__} {e}")
+            return
+
+        logger.debug("Safety models are using fp16 weights")
+
+    @staticmethod
+    def _configure_cpu_threads() -> None:
+        """Give the CPU safety models more than the single intra-op thread inherited from `OMP_NUM_THREADS=1`.
+
+        The worker pins `OMP_NUM_THREADS` to 1 so the inference processes do not oversubscribe the CPU, which also
+        leaves the CPU safety forward running on one core. Half the cores are used by default, leaving the rest to
+        the inference processes; `AIWORKER_SAFETY_THREADS` overrides this.
+        """
+        num_threads = max(1, (os.cpu_count() or 1) // 2)
+        env_val = os.getenv("AIWORKER_SAFETY_THREADS")
+        if env_val is not None:
+            try:
+                parsed = int(env_val)
+            except ValueError:
+                parsed = 0
+            if parsed < 1:
+                logger.warning(
+                    f"Invalid AIWORKER_SAFETY_THREADS '{env_val}', using {num_threads}. It must be a positive integer.",
+                )
+            else:
+                num_threads = parsed
+
+        try:
+            import torch
+
+            torch.set_num_threads(num_threads)
+        except Exception as e:
+            logger.warning(f"Failed to set the safety process thread count: {type(e).__name__} {e}")
+            return
+
+        logger.debug(f"Safety models are using {num_threads} CPU threads")
+
+    def _quantize_for_cpu(self) -> None:
+        """Dynamically quantize the `Linear` layers of the safety models to int8 for CPU inference.
+
+        This quarters the weight bandwidth of CLIP's transformer and DeepDanbooru's classifier head, at the cost of
+        slightly shifted similarity scores near the NSFW thresholds, so it is opt-in with `AIWORKER_SAFETY_INT8=1`.
+        Convolutions are not covered by dynamic quantization and stay in fp32.
+        """
+        try:
+            import torch
+
+            for model in (self._deep_danbooru_model, self._interrogator.clip_model):
+                torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        except Exception as e:
+            logger.warning(f"Failed to quantize the safety models to int8: {type(e).__name__} {e}")
+            return
+
+        logger.debug("Safety models are using int8 dynamic quantization")
+
+    @staticmethod
+    def _get_batch_size() -> int:
+        """Return the CLIP batch size from `AIWORKER_SAFETY_BATCH_SIZE`, falling back to the default if invalid."""
+        env_val = os.getenv("AIWORKER_SAFETY_BATCH_SIZE")
+        if env_val is None:
+            return _DEFAULT_SAFETY_BATCH_SIZE
+
+        try:
+            batch_size = int(env_val)
+        except ValueError:
+            batch_size = 0
+
+        if batch_size < 1:
+            logger.warning(
+                f"Invalid AIWORKER_SAFETY_BATCH_SIZE '{env_val}', using {_DEFAULT_SAFETY_BATCH_SIZE}. "
+                "It must be a positive integer.",
+            )
+            return _DEFAULT_SAFETY_BATCH_SIZE
+
+        return batch_size
+
+    def _warm_up_models(self) -> None:
+        """Run a throwaway check so the first real job does not pay the cold start.
+
+        The first check encodes and caches the text features for every predicate and concept, and lets PyTorch
+        allocate its workspaces, which otherwise adds several seconds to the first job on CPU.
+        """
+        time_start = time.time()
+        warm_up_image = Image.new("RGB", (512, 512))
+        try:
+            # Also warms the batched image encode used by `_receive_and_handle_control_message`
+            image_features = self._batch_image_features([warm_up_image])
+            self._nsfw_checker.check_for_nsfw(
+                image=warm_up_image,
+                prompt="",
+                model_info=None,
+                image_tensor=image_features[0] if image_features else None,
+            )
+            # DeepDanbooru only runs for images that look like anime, which a blank image does not
+            self._nsfw_checker.check_for_nsfw_anime_only(image=warm_up_image)
+        except Exception as e:
+            logger.warning(f"Failed to warm up the safety models: {type(e).__name__} {e}")
+            return
+        finally:
+            warm_up_image.close()
+
+        logger.debug(f"Warmed up the safety models in {time.time() - time_start:.2f} seconds")
 
     def load_censor_files(self) -> None:
         """Load the censor images from disk."""
@@ -175,9 +545,147 @@ class HordeSafetyProcess(HordeProcess):
             CensorReason.SFW_WORKER: "nsfw_censor_sfw_worker.png",
         }
 
-        for reason in CensorReason:
-            with open(ASSETS_FOLDER_PATH / file_lookup[reason], "rb") as f:
-                self._set_censor_image(reason, base64.b64encode(f.read()).decode("utf-8"))
+        # Encoded once here; every censored job reuses the same `str` objects.
+        self._censor_images_base64 = {
+            reason: b64encode((ASSETS_FOLDER_PATH / file_name).read_bytes()).decode("ascii")
+            for reason, file_name in file_lookup.items()
+        }
+
+    def _batch_image_features(self, images: list[Image.Image]) -> "list[torch.Tensor] | None":
+        """Encode the CLIP image features for all of the images of a job in a single forward pass.
+
+        `NSFWChecker.check_for_nsfw` accepts precomputed features through `image_tensor` for its CLIP
+        interrogation, so that encode runs once per chunk instead of once per image. The checker still runs its own
+        per-image CLIP forward for the safety classification. This mirrors `Interrogator.image_to_features`, only
+        stacked along the batch dimension. The caller passes at most `_batch_size` images, which bounds the
+        activation memory of the forward.
+
+        Args:
+            images (list[Image.Image]): The decoded images of one chunk of the job.
+
+        Returns:
+            list[torch.Tensor] | None: The normalised features for each image, in order, or `None` if the batched
+            encode failed and the checker should encode each image itself.
+        """
+        if not images:
+            return None
+
+        try:
+            import torch
+
+            interrogator = self._interrogator
+            interrogator._prepare_clip()
+            device_type = torch.device(interrogator.device).type
+            batch = torch.stack([interrogator.clip_preprocess(image) for image in images]).to(interrogator.device)
+            # Mixed precision only where it is supported and faster; CPU autocast would run in bfloat16.
+            with torch.no_grad(), torch.autocast(device_type=device_type, enabled=device_type == "cuda"):
+                image_features = interrogator.clip_model.encode_image(batch)
+                image_features /= image_features.norm(dim=-1, keepdim=True)
+        except Exception as e:
+            logger.warning(f"Batched CLIP encode failed, falling back to per-image: {type(e).__name__} {e}")
+            return None
+
+        return list(image_features)
+
+    def _save_image(
+        self,
+        image: Image.Image,
+        output_path: str,
+        metadata: PngImagePlugin.PngInfo | None,
+        job_id: JobID,
+        encoded_image: bytes = b"",
+    ) -> HordeSavedImageInfo | None:
+        """Save an image as a PNG, retrying without metadata if embedding it fails. Closes the image afterwards.
+
+        When `encoded_image` is already a PNG, the metadata chunks are spliced in ahead of its image data and the
+        bytes are written as-is, which skips decoding and re-compressing the pixels.
+
+        NOTE: All images are intentionally saved to disk regardless of their safety classification (including
+        CSAM). The CSAM/NSFW flags embedded in the metadata allow downstream tooling to identify and handle
+        flagged content. Skipping the save for CSAM would discard evidence that may be needed for review/reporting.
+
+        Returns:
+            HordeSavedImageInfo | None: The saved image, or `None` if it could not be saved.
+        """
+        try:
+            idat_offset = _find_first_idat_offset(encoded_image)
+            if idat_offset is not None:
+                encoded_view = memoryview(encoded_image)
+                with open(output_path, "wb") as output_file:
+                    output_file.write(encoded_view[:idat_offset])
+                    if metadata is not None:
+                        output_file.write(_encode_png_chunks(metadata.chunks))
+                    output_file.write(encoded_view[idat_offset:])
+            elif metadata is not None:
+                image.save(output_path, "png", pnginfo=metadata, compress_level=_PNG_COMPRESS_LEVEL)
+            else:
+                image.save(output_path, "png", compress_level=_PNG_COMPRESS_LEVEL)
+
+            if metadata is not None:
+                logger.opt(colors=True).info(
+                    f"<b><fg #FF69B4>Saved 1 image + embedded metadata to disk for job {job_id}</></>",
+                )
+                return HordeSavedImageInfo(path=output_path, metadata_embedded=True)
+
+            logger.opt(colors=True).info(
+                f"<b><fg #FF69B4>Saved 1 image to disk (no metadata) for job {job_id}</></>",
+            )
+            return HordeSavedImageInfo(path=output_path, metadata_embedded=False)
+        except Exception as e:
+            try:
+                image.save(output_path, "png", compress_level=_PNG_COMPRESS_LEVEL)
+                logger.warning(
+                    f"Failed to save image with embedded metadata for job {job_id}; "
+                    f"saved without metadata instead: {type(e).__name__} {e}. Path: {output_path}",
+                )
+                return HordeSavedImageInfo(path=output_path, metadata_embedded=False)
+            except Exception as save_err:
+                logger.error(
+                    f"Failed to save image for job {job_id}: {type(save_err).__name__} {save_err}. Path: {output_path}",
+                )
+                return None
+        finally:
+            # Release the decoded raster now rather than waiting for GC.
+            image.close()
+
+    def _get_output_directory(self, now: datetime) -> str | None:
+        """Return the dated output directory for `now`, creating it the first time it is needed each day.
+
+        Args:
+            now (datetime): The time the current job started.
+
+        Returns:
+            str | None: The path `<output dir>/YYYY/YYYY-MM/YYYY-MM-DD`, or `None` if it could not be created.
+        """
+        year_month_day = now.strftime("%Y-%m-%d")
+        if year_month_day == self._cached_output_date:
+            return self._cached_output_dir
+
+        base_output_directory = self._output_base_directory
+
+        # Build directories
+        year_dir = os.path.join(base_output_directory, now.strftime("%Y"))
+        year_month_dir = os.path.join(year_dir, now.strftime("%Y-%m"))
+        year_month_day_dir = os.path.join(year_month_dir, year_month_day)
+
+        # Create all directories
+        try:
+            os.makedirs(year_month_day_dir, exist_ok=True)
+
+            # Apply permissions only to the three relevant ones
+            for d in [year_dir, year_month_dir, year_month_day_dir]:
+                os.chmod(d, 0o777)
+        except OSError as e:
+            logger.error(
+                f"Failed to create or set permissions on output directory {year_month_day_dir}: "
+                f"{type(e).__name__} {e}. Images will not be saved to disk.",
+            )
+            # Not cached, so the next job tries again
+            return None
+
+        self._cached_output_date = year_month_day
+        self._cached_output_dir = year_month_day_dir
+        return year_month_day_dir
 
     @override
     def _receive_and_handle_control_message(self, message: HordeControlMessage) -> None:
@@ -193,10 +701,13 @@ class HordeSafetyProcess(HordeProcess):
             info="Starting safety evaluation",
         )
 
-        self.send_memory_report_message(include_vram=False)
-
         time_start = time.time()
 
+        # Back-to-back jobs don't need a fresh RAM figure each; report at most every `_memory_report_interval`
+        if time_start - self._last_memory_report_time >= self._memory_report_interval:
+            self.send_memory_report_message(include_vram=False)
+            self._last_memory_report_time = time_start
+
         logger.info(
             f"Horde safety process received job {message.job_id}. Number of images: {len(message.images_base64)}",
         )
@@ -211,308 +722,180 @@ class HordeSafetyProcess(HordeProcess):
 
         # ! IMPORTANT: Start own code
         saved_images: list[HordeSavedImageInfo] = []
+        save_futures: list[Future[HordeSavedImageInfo | None]] = []
 
-        # Set base output directory
-        base_output_directory = "/output"
-
-        # Pre-calculate the date-based output directory parts
         now = datetime.now()
-        year = now.strftime("%Y")
-        year_month = now.strftime("%Y-%m")
-        year_month_day = now.strftime("%Y-%m-%d")
-
-        # Construct the full output directory path: /output/YYYY/YYYY-MM/YYYY-MM-DD/
-        output_directory = os.path.join(base_output_directory, year, year_month, year_month_day)
-
-        # Build directories
-        year_dir = os.path.join(base_output_directory, year)
-        year_month_dir = os.path.join(year_dir, year_month)
-        year_month_day_dir = os.path.join(year_month_dir, year_month_day)
 
-        # Create all directories
-        try:
-            os.makedirs(year_month_day_dir, exist_ok=True)
-
-            # Apply permissions only to the three relevant ones
-            for d in [year_dir, year_month_dir, year_month_day_dir]:
-                os.chmod(d, 0o777)
-        except OSError as e:
-            logger.error(
-                f"Failed to create or set permissions on output directory {year_month_day_dir}: "
-                f"{type(e).__name__} {e}. Images will not be saved to disk.",
+        # Every image in the job shares the job's timestamp; the image index keeps the filenames unique
+        timestamp = f"{now:%Y-%m-%d_%H-%M-%S}.{now.microsecond // 1000:03d}"
+
+        # The generation metadata is identical for every image in the job, so it is only rendered and encoded into
+        # PNG chunks once; each image copies the encoded chunks and only adds its own verdict.
+        shared_pnginfo = PngImagePlugin.PngInfo()
+        if self._save_outputs and self._embed_metadata:
+            for key, value in _build_shared_pnginfo_chunks(message, now.isoformat(timespec="seconds")):
+                shared_pnginfo.add_text(key, value)
+
+        output_directory = self._get_output_directory(now) if self._save_outputs else None
+
+        # The verdict depends on the prompt and model as well as the pixels, so those are part of every cache key.
+        job_digest = hashlib.blake2b(digest_size=16)
+        job_digest.update(message.prompt.encode("utf-8"))
+        job_digest.update(json.dumps(message.horde_model_info, sort_keys=True, default=str).encode("utf-8"))
+
+        # Images are decoded and checked `_batch_size` at a time, so only one chunk of decoded images (plus those
+        # still being saved) is held at once. Each chunk is decoded in parallel (PIL releases the GIL while
+        # inflating) and its CLIP image features are encoded in a single batched forward pass. Images which fail to
+        # decode are kept as `None` to preserve result ordering.
+        for chunk_start in range(0, len(message.images_base64), self._batch_size):
+            decoded_images = list(
+                self._io_pool.map(
+                    _decode_image_base64,
+                    message.images_base64[chunk_start : chunk_start + self._batch_size],
+                ),
             )
-            output_directory = None
-
-        for image_index, image_base64 in enumerate(message.images_base64):
-            # Decode the image from base64
-            image_bytes = BytesIO(base64.b64decode(image_base64))
-
-            # Generate a unique timestamp for each image in the batch
-            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S.%f")[:-3]
-            # Include image index to ensure unique filenames for batch jobs
-            output_path = (
-                os.path.join(output_directory, f"{timestamp}_{image_index}.png")
-                if output_directory is not None
-                else None
+
+            cache_keys: list[bytes] = []
+            for _, encoded_image in decoded_images:
+                image_digest = job_digest.copy()
+                image_digest.update(encoded_image)
+                cache_keys.append(image_digest.digest())
+
+            # Images with a cached verdict are left out of the batched encode
+            needs_features = [
+                image is not None and cache_key not in self._nsfw_result_cache
+                for (image, _), cache_key in zip(decoded_images, cache_keys, strict=True)
+            ]
+            image_features = self._batch_image_features(
+                [image for (image, _), needed in zip(decoded_images, needs_features, strict=True) if needed],
             )
+            image_features_iter = iter(image_features) if image_features is not None else None
+
+            for chunk_index, (image_as_pil_0, encoded_image) in enumerate(decoded_images):
+                image_index = chunk_start + chunk_index
+                if image_as_pil_0 is None:
+                    safety_evaluations.append(
+                        HordeSafetyEvaluation(
+                            is_nsfw=True,
+                            is_csam=True,
+                            replacement_image_base64=None,
+                            failed=True,
+                        ),
+                    )
+                    continue
 
-            # Open the image using PIL; if this fails the image data is corrupted and we skip it
-            try:
-                image_as_pil_0 = Image.open(image_bytes)
-                # Force a full load into memory so subsequent operations on image_bytes
-                # (or a second open) do not interfere with this image object.
-                image_as_pil_0.load()
-            except (OSError, ValueError) as e:
-                logger.error(f"Failed to open image: {type(e).__name__} {e}")
-                safety_evaluations.append(
-                    HordeSafetyEvaluation(
-                        is_nsfw=True,
-                        is_csam=True,
-                        replacement_image_base64=None,
-                        failed=True,
-                    ),
+                image_tensor = (
+                    next(image_features_iter)
+                    if image_features_iter is not None and needs_features[chunk_index]
+                    else None
                 )
-                image_bytes.close()
-                continue
-
-            original_prompt = message.prompt
-
-            metadata: PngImagePlugin.PngInfo | None = None
 
-            try:
-                # Create a PngInfo object to hold metadata
-                metadata = PngImagePlugin.PngInfo()
-
-                if "###" in original_prompt:
-                    # Split the text at "###"
-                    parts = original_prompt.split("###")
-
-                    # Get the string before and after "###"
-                    positive_prompt = parts[0]
-                    negative_prompt = parts[1]
-                else:
-                    positive_prompt = original_prompt
-                    negative_prompt = ""
-
-                generation_metadata = message.generation_metadata or {}
-                sanitized_negative_prompt = generation_metadata.get("sanitized_negative_prompt")
-
-                # Add custom metadata
-                metadata.add_text("Positive prompt", positive_prompt)
-                metadata.add_text(
-                    "Negative prompt",
-                    sanitized_negative_prompt if sanitized_negative_prompt is not None else negative_prompt,
+                # Include image index to ensure unique filenames for batch jobs
+                output_path = (
+                    os.path.join(output_directory, f"{timestamp}_{image_index}.png")
+                    if output_directory is not None
+                    else None
                 )
 
-                metadata.add_text(
-                    "Created at",
-                    datetime.now().isoformat(timespec="seconds"),
-                )
+                # ! IMPORTANT: End own code
 
-                def _add_metadata_text(
-                    key: str,
-                    value: object,
-                    *,
-                    _md: PngImagePlugin.PngInfo | None = metadata,
-                ) -> None:
-                    if _md is None:
-                        return
-                    if value is None:
-                        _md.add_text(key, "")
-                        return
-                    if isinstance(value, str):
-                        _md.add_text(key, value)
-                    else:
-                        _md.add_text(key, json.dumps(value, ensure_ascii=False, default=str))
-
-                # Explicitly add key fields when available
-                _add_metadata_text("Model name", generation_metadata.get("model"))
-                _add_metadata_text("Model hash", generation_metadata.get("model_hash"))
-                _add_metadata_text("Sampler", generation_metadata.get("sampler_name"))
-                _add_metadata_text("Seed", generation_metadata.get("seed"))
-                _add_metadata_text("Seed resize from", generation_metadata.get("seed_resize_from"))
-                _add_metadata_text("Seed resize from width", generation_metadata.get("seed_resize_from_width"))
-                _add_metadata_text("Seed resize from height", generation_metadata.get("seed_resize_from_height"))
-                _add_metadata_text("CFG scale", generation_metadata.get("cfg_scale"))
-                _add_metadata_text("Denoising strength", generation_metadata.get("denoising_strength"))
-                _add_metadata_text(
-                    "Steps",
-                    (
-                        generation_metadata.get("steps")
-                        if generation_metadata.get("steps") is not None
-                        else generation_metadata.get("ddim_steps")
-                    ),
-                )
-                _add_metadata_text("Version", generation_metadata.get("version"))
-                post_processing = generation_metadata.get("post_processing")
-                if isinstance(post_processing, list):
-                    _add_metadata_text("Post processing", ", ".join(str(v) for v in post_processing))
-                else:
-                    _add_metadata_text("Post processing", post_processing)
+                original_prompt = message.prompt
 
-                lora_descriptions = generation_metadata.get("lora_descriptions") or []
-                if isinstance(lora_descriptions, list) and lora_descriptions:
-                    lora_text = ", ".join(lora_descriptions)
-                else:
-                    lora_text = ""
-                metadata.add_text("Loras", lora_text)
-
-                lora_hashes = generation_metadata.get("lora_hashes")
-                if lora_hashes is None:
-                    try:
-                        lora_hash_list: list[str] = []
-                        loras = generation_metadata.get("loras") or []
-                        for lora in loras:
-                            if isinstance(lora, dict):
-                                lora_hash = lora.get("hash") or lora.get("lora_hash") or lora.get("sha")
-                            else:
-                                lora_hash = (
-                                    getattr(lora, "hash", None)
-                                    or getattr(lora, "lora_hash", None)
-                                    or getattr(lora, "sha", None)
-                                )
-                            if lora_hash is not None:
-                                lora_hash_list.append(str(lora_hash))
-                        lora_hashes = lora_hash_list
-                    # ! IMPORTANT: Start of own code
-                    except (AttributeError, KeyError, TypeError) as e:
-                        # Handle cases where lora object doesn't have expected attributes
-                        logger.debug(f"Failed to extract lora hash: {e}")
-                        lora_hashes = None
-                    # ! IMPORTANT: End of own code
-
-                if isinstance(lora_hashes, list):
-                    _add_metadata_text("LoRA hashes", ", ".join(str(v) for v in lora_hashes))
+                cache_key = cache_keys[chunk_index]
+                nsfw_result: NSFWResult | None = self._nsfw_result_cache.get(cache_key)
+                if nsfw_result is not None:
+                    self._nsfw_result_cache.move_to_end(cache_key)
+                    logger.debug(f"Reusing the cached safety verdict for an identical image in job {message.job_id}")
                 else:
-                    _add_metadata_text("LoRA hashes", lora_hashes)
-
-                if "karras" in generation_metadata and "schedule_type" not in generation_metadata:
-                    schedule_type = "karras" if generation_metadata.get("karras") else "native"
-                    _add_metadata_text("Schedule type", schedule_type)
-
-            # ! IMPORTANT: Start of own code
-            except (KeyError, ValueError, TypeError) as e:
-                # Handle metadata extraction errors, but continue with image processing
-                logger.error(f"Failed to add metadata: {e}")
-            # ! IMPORTANT: End of own code
-            # ! IMPORTANT: End own code
-
-            # ! IMPORTANT: Start of own code
-            # Reuse the already-opened (and fully loaded) image object for NSFW checking.
-            # A second Image.open(image_bytes) would fail because the BytesIO stream
-            # position was advanced by the first open above.
-            image_as_pil = image_as_pil_0
-            # ! IMPORTANT: End of own code
-
-            nsfw_result: NSFWResult | None = self._nsfw_checker.check_for_nsfw(
-                image=image_as_pil,
-                prompt=original_prompt,  # ! IMPORTANT: Changed "message.prompt" to "original_prompt"
-                model_info=message.horde_model_info,
-            )
+                    nsfw_result = self._nsfw_checker.check_for_nsfw(
+                        image=image_as_pil_0,
+                        prompt=original_prompt,  # ! IMPORTANT: Changed "message.prompt" to "original_prompt"
+                        model_info=message.horde_model_info,
+                        image_tensor=image_tensor,
+                    )
+                    if nsfw_result is not None:
+                        self._nsfw_result_cache[cache_key] = nsfw_result
+                        if len(self._nsfw_result_cache) > _NSFW_RESULT_CACHE_SIZE:
+                            self._nsfw_result_cache.popitem(last=False)
+
+                if nsfw_result is None:
+                    logger.error(f"NSFW checker returned None for image in job {message.job_id}; treating as unsafe.")
+                    safety_evaluations.append(
+                        HordeSafetyEvaluation(
+                            is_nsfw=True,
+                            is_csam=False,
+                            replacement_image_base64=self._censor_images_base64[CensorReason.SFW_WORKER],
+                            failed=True,
+                        ),
+                    )
+                    image_as_pil_0.close()
+                    continue
+
+                replacement_image_base64: str | None = None
 
-            if nsfw_result is None:
-                logger.error(f"NSFW checker returned None for image in job {message.job_id}; treating as unsafe.")
-                safety_evaluations.append(
-                    HordeSafetyEvaluation(
-                        is_nsfw=True,
-                        is_csam=False,
-                        replacement_image_base64=self.censor_sfw_worker_image_base64,
-                        failed=True,
-                    ),
-                )
-                image_as_pil_0.close()
-                image_bytes.close()
-                continue
-
-            replacement_image_base64: str | None = None
-
-            if nsfw_result.is_csam:
-                replacement_image_base64 = self.censor_csam_image_base64
-                logger.debug(f"CSAM detected in image {message.job_id}. Image is deleted.")
-            elif message.sfw_worker and nsfw_result.is_nsfw:
-                replacement_image_base64 = self.censor_sfw_worker_image_base64
-                logger.info(f"SFW worker detected NSFW in image {message.job_id}.")
-            elif message.censor_nsfw and nsfw_result.is_nsfw:
-                replacement_image_base64 = self.censor_sfw_request_image_base64
-                logger.info(f"Censor list detected NSFW in image {message.job_id}.")
-
-            # ! IMPORTANT: Start own code
-            if metadata is not None:
                 if nsfw_result.is_csam:
-                    metadata.add_text("Safety", "csam")
-                elif replacement_image_base64:
-                    metadata.add_text("Safety", "censored")
-                elif nsfw_result.is_nsfw:
-                    metadata.add_text("Safety", "nsfw")
-                else:
-                    metadata.add_text("Safety", "clean")
-                metadata.add_text("NSFW", "true" if nsfw_result.is_nsfw else "false")
-                metadata.add_text("CSAM", "true" if nsfw_result.is_csam else "false")
+                    replacement_image_base64 = self._censor_images_base64[CensorReason.CSAM]
+                    logger.debug(f"CSAM detected in image {message.job_id}. Image is deleted.")
+                elif message.sfw_worker and nsfw_result.is_nsfw:
+                    replacement_image_base64 = self._censor_images_base64[CensorReason.SFW_WORKER]
+                    logger.info(f"SFW worker detected NSFW in image {message.job_id}.")
+                elif message.censor_nsfw and nsfw_result.is_nsfw:
+                    replacement_image_base64 = self._censor_images_base64[CensorReason.SFW_REQUEST]
+                    logger.info(f"Censor list detected NSFW in image {message.job_id}.")
 
-            try:
-                # Save the image as a PNG file (skip if no output directory is available).
-                # NOTE: All images are intentionally saved to disk regardless of their safety
-                # classification (including CSAM). The CSAM/NSFW flags embedded in the metadata
-                # allow downstream tooling to identify and handle flagged content. Skipping the
-                # save for CSAM would discard evidence that may be needed for review/reporting.
+                # ! IMPORTANT: Start own code
                 if output_path is None:
-                    logger.debug(
-                        f"Skipping image save for job {message.job_id}: "
-                        "no output directory available (creation failed)",
-                    )
-                elif metadata is not None:
-                    image_as_pil_0.save(output_path, "png", pnginfo=metadata)
-                else:
-                    image_as_pil_0.save(output_path, "png")
-
-                if output_path is not None:
-                    if metadata is not None:
-                        logger.opt(colors=True).info(
-                            "<b><fg #FF69B4>"
-                            f"Saved 1 image + embedded metadata to disk for job {message.job_id}"
-                            "</></>",
-                        )
-                        saved_images.append(HordeSavedImageInfo(path=output_path, metadata_embedded=True))
-                    else:
-                        logger.opt(colors=True).info(
-                            "<b><fg #FF69B4>"
-                            f"Saved 1 image to disk (no metadata) for job {message.job_id}"
-                            "</></>",
-                        )
-                        saved_images.append(HordeSavedImageInfo(path=output_path, metadata_embedded=False))
-            except Exception as e:
-                if output_path is not None:
-                    try:
-                        image_as_pil_0.save(output_path, "png")
-                        logger.warning(
-                            f"Failed to save image with embedded metadata for job {message.job_id}; "
-                            f"saved without metadata instead: {type(e).__name__} {e}. Path: {output_path}",
-                        )
-                        saved_images.append(HordeSavedImageInfo(path=output_path, metadata_embedded=False))
-                    except Exception as save_err:
-                        logger.error(
-                            f"Failed to save image for job {message.job_id}: "
-                            f"{type(save_err).__name__} {save_err}. Path: {output_path}",
+                    if self._save_outputs:
+                        logger.debug(
+                            f"Skipping image save for job {message.job_id}: "
+                            "no output directory available (creation failed)",
                         )
+                    image_as_pil_0.close()
                 else:
-                    logger.error(
-                        f"Failed to save image for job {message.job_id}: "
-                        f"{type(e).__name__} {e}",
+                    # Censored and CSAM images are saved too, see `_save_image`; the metadata records the verdict.
+                    metadata: PngImagePlugin.PngInfo | None = None
+                    if self._embed_metadata:
+                        metadata = PngImagePlugin.PngInfo()
+                        metadata.chunks = shared_pnginfo.chunks.copy()
+                        if nsfw_result.is_csam:
+                            metadata.add_text("Safety", "csam")
+                        elif replacement_image_base64:
+                            metadata.add_text("Safety", "censored")
+                        elif nsfw_result.is_nsfw:
+                            metadata.add_text("Safety", "nsfw")
+                        else:
+                            metadata.add_text("Safety", "clean")
+                        metadata.add_text("NSFW", "true" if nsfw_result.is_nsfw else "false")
+                        metadata.add_text("CSAM", "true" if nsfw_result.is_csam else "false")
+
+                    # Saving (and PNG encoding, which releases the GIL) overlaps with checking the next image.
+                    save_futures.append(
+                        self._io_pool.submit(
+                            self._save_image,
+                            image_as_pil_0,
+                            output_path,
+                            metadata,
+                            message.job_id,
+                            encoded_image,
+                        ),
                     )
-            # ! IMPORTANT: End own code
+                # ! IMPORTANT: End own code
 
-            safety_evaluations.append(
-                HordeSafetyEvaluation(
-                    is_nsfw=nsfw_result.is_nsfw,
-                    is_csam=nsfw_result.is_csam,
-                    replacement_image_base64=replacement_image_base64,
-                ),
-            )
+                safety_evaluations.append(
+                    HordeSafetyEvaluation(
+                        is_nsfw=nsfw_result.is_nsfw,
+                        is_csam=nsfw_result.is_csam,
+                        replacement_image_base64=replacement_image_base64,
+                    ),
+                )
 
-            # Release the decoded raster and PNG byte buffer now rather than waiting for
-            # GC — for large batches this keeps at most one decoded image in memory.
-            image_as_pil_0.close()
-            image_bytes.close()
+        for save_future in save_futures:
+            saved_image = save_future.result()
+            if saved_image is not None:
+                saved_images.append(saved_image)
+            else:
+                # The output directory may have been removed since it was cached; recreate it for the next job
+                self._cached_output_date = None
 
         time_elapsed = time.time() - time_start
 
@@ -548,4 +931,4 @@ class HordeSafetyProcess(HordeProcess):
 
     @override
     def cleanup_for_exit(self) -> None:
-        return
+        self._io_pool.shutdown(wait=True)
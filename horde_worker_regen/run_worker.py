@@ -156,6 +156,63 @@ def main(
 class LogConsoleRewriter(io.StringIO):
     """Makes the console output more readable by shortening certain strings."""
 
+    # Each entry: (pattern, replacement, exact_word_match, case_sensitive)
+    # exact_word_match=True wraps the pattern in \b boundaries so "start_inference"
+    # won't match inside "start_inference_process".
+    # case_sensitive=False makes that entry ignore case.
+    _REPLACEMENTS = (
+        ("horde_worker_regen.process_management.process_manager", "Worker",      True, True),
+        ("horde_worker_regen.",                                   "",            True, True),
+        ("receive_and_handle_process_messages",                   "Process",     True, True),
+        ("start_inference_processes",                             "Starting",    True, True),
+        ("_start_inference_process",                              "Starting",    True, True),
+        ("start_inference_process",                               "Starting",    True, True),
+        ("start_safety_process",                                  "Safety",      True, True),
+        ("start_inference",                                       "Process",     True, True),
+        ("print_status_method",                                   "Status",      True, True),
+        ("log_kudos_info",                                        "Kudos",       True, True),
+        ("submit_single_generation",                              "Submit",      True, True),
+        ("preload_models",                                        "Loading",     True, True),
+        ("api_job_pop",                                           "New Job",     True, True),
+        ("_process_control_loop",                                 "Control",     True, True),
+        ("_bridge_data_loop",                                     "Config",      True, True),
+        ("enable_performance_mode",                               "Performance", True, True),
+        ("replace_hung_processes",                                "Recovery",    True, True),
+        ("handle_job_fault",                                      "Job Fault",   True, True),
+        ("api_submit_job",                                        "Submitting",  True, True),
+        ("_end_inference_process",                                "Stopping",    True, True),
+    )
+
+    # All entries folded into one alternation, one capture group per entry, so a message is scanned
+    # once rather than once per entry; the group that matched picks the replacement. At any position
+    # earlier entries win, which is why longer names are listed before their prefixes.
+    _REPLACEMENT_PATTERN = re.compile(
+        "|".join(
+            "("
+            + ("" if case_sensitive else "(?i:")
+            + ((r"\b" + re.escape(old) + r"\b") if exact else re.escape(old))
+            + ("" if case_sensitive else ")")
+            + ")"
+            for old, _, exact, case_sensitive in _REPLACEMENTS
+        ),
+    )
+
+    _TRACEBACK_START_INDICATORS = (
+        "Traceback (most recent call last)",
+        "Traceback (innermost last)",
+    )
+
+    _TRACEBACK_INDICATORS = (
+        "  File ",
+        "    ^",
+    )
+
+    _ERROR_INDICATORS = (
+        "Error:",
+        "Exception:",
+        "Warning:",
+    )
+
     def __init__(self, original_iostream: io.TextIOBase) -> None:
         """Initialise the rewriter."""
         self.original_iostream = original_iostream
@@ -165,34 +222,34 @@ class LogConsoleRewriter(io.StringIO):
 
         self.line_number_pattern = re.compile(pattern)
 
+    @classmethod
+    def _replacement_for(cls, match: re.Match[str]) -> str:
+        """Return the replacement for the entry whose capture group matched."""
+        index = match.lastindex
+        assert index is not None  # every alternative is a capture group
+        return cls._REPLACEMENTS[index - 1][1]
+
     def write(self, message: str) -> int:
         """Rewrite the message to make it more readable where possible."""
-        # Check if this message starts or continues a traceback
-        traceback_start_indicators = [
-            "Traceback (most recent call last)",
-            "Traceback (innermost last)",
-        ]
-
-        traceback_indicators = [
-            "  File ",
-            "    ^",
-        ]
-
-        error_indicators = [
-            "Error:",
-            "Exception:",
-            "Warning:",
-        ]
+        if self.original_iostream is None:
+            raise ValueError("self.original_iostream. is None!")
+
+        return self.original_iostream.write(self.rewrite(message))
 
+    def rewrite(self, message: str) -> str:
+        """Return the message as :meth:`write` would print it, without writing it.
+
+        The buffered console sink calls this directly so it can batch writes to the original stream.
+        """
         # Check if we're starting a traceback
-        if any(indicator in message for indicator in traceback_start_indicators):
+        if any(indicator in message for indicator in self._TRACEBACK_START_INDICATORS):
             self.in_traceback = True
 
         # Check if this line is part of a traceback
-        is_traceback_line = any(indicator in message for indicator in traceback_indicators)
+        is_traceback_line = any(indicator in message for indicator in self._TRACEBACK_INDICATORS)
 
         # Check if this is an error/exception line (likely the end of a traceback)
-        is_error_line = any(indicator in message for indicator in error_indicators)
+        is_error_line = any(indicator in message for indicator in self._ERROR_INDICATORS)
 
         # Reset traceback mode after an empty line (common after error messages)
         if self.in_traceback and not message.strip():
@@ -214,46 +271,13 @@ class LogConsoleRewriter(io.StringIO):
         should_modify = not self.in_traceback and not is_traceback_line and not is_error_line
 
         if should_modify:
-            # Each entry: (pattern, replacement, exact_word_match, case_sensitive)
-            # exact_word_match=True wraps the pattern in \b boundaries so "start_inference"
-            # won't match inside "start_inference_process".
-            # case_sensitive=False adds re.IGNORECASE.
-            replacements = [
-                ("horde_worker_regen.process_management.process_manager", "Worker",      True, True),
-                ("horde_worker_regen.",                                   "",            True, True),
-                ("receive_and_handle_process_messages",                   "Process",     True, True),
-                ("start_inference_processes",                             "Starting",    True, True),
-                ("_start_inference_process",                              "Starting",    True, True),
-                ("start_inference_process",                               "Starting",    True, True),
-                ("start_safety_process",                                  "Safety",      True, True),
-                ("start_inference",                                       "Process",     True, True),
-                ("print_status_method",                                   "Status",      True, True),
-                ("log_kudos_info",                                        "Kudos",       True, True),
-                ("submit_single_generation",                              "Submit",      True, True),
-                ("preload_models",                                        "Loading",     True, True),
-                ("api_job_pop",                                           "New Job",     True, True),
-                ("_process_control_loop",                                 "Control",     True, True),
-                ("_bridge_data_loop",                                     "Config",      True, True),
-                ("enable_performance_mode",                               "Performance", True, True),
-                ("replace_hung_processes",                                "Recovery",    True, True),
-                ("handle_job_fault",                                      "Job Fault",   True, True),
-                ("api_submit_job",                                        "Submitting",  True, True),
-                ("_end_inference_process",                                "Stopping",    True, True),
-            ]
-
-            for old, new, exact, case_sensitive in replacements:
-                flags = 0 if case_sensitive else re.IGNORECASE
-                pattern = (r'\b' + re.escape(old) + r'\b') if exact else re.escape(old)
-                message = re.sub(pattern, new, message, flags=flags)
+            message = self._REPLACEMENT_PATTERN.sub(self._replacement_for, message)
 
             replacement = ""
 
             message = self.line_number_pattern.sub(replacement, message)
 
-        if self.original_iostream is None:
-            raise ValueError("self.original_iostream. is None!")
-
-        return self.original_iostream.write(message)
+        return message
 
     def flush(self) -> None:
         """Flush the buffer to the original stdout."""
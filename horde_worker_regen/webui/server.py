@@ -2,19 +2,24 @@
 
 import asyncio
 import base64
+import binascii
+import gzip
+import hashlib
 import io
 import json
 import math
 import os
 import re
 import sqlite3
+import struct
 import time
+import zlib
 from collections import deque
 from collections.abc import Awaitable, Callable
 from typing import Any
 
 import aiohttp
-from aiohttp import web
+from aiohttp import hdrs, web
 from loguru import logger
 
 import horde_worker_regen
@@ -31,9 +36,35 @@ except ImportError:
         "Install the 'Pillow' package to enable thumbnail generation in the web UI.",
     )
 
+try:
+    # Serialises the large status/stats payloads several times faster than the standard library
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    # Compresses the index page about a fifth smaller than gzip for browsers that accept br
+    import brotli
+except ImportError:
+    brotli = None  # type: ignore[assignment]
+
 _THUMBNAIL_MAX_PX = 384
 """Maximum pixel dimension (width or height) for gallery thumbnails."""
 
+_HEALTH_BODY = b'{"status": "ok"}'
+"""The constant /health response body, encoded once instead of per liveness probe."""
+
+_STATUS_GZIP_MIN_BYTES = 1024
+"""/api/status bodies at least this large are also kept gzip-compressed, so every tab that polls in the
+same update interval shares one compression instead of aiohttp compressing per response."""
+
+_INDEX_BROTLI_QUALITY = 11
+"""Brotli quality for the index page. The highest setting takes most of a second, which is paid once per
+change of the injected horde snapshots (in the executor), not per page load."""
+
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\xff"
+"""A fixed gzip member header: deflate, no flags, no mtime, unknown OS."""
+
 # Patterns for variable data stripped when normalising error messages for grouping.
 _ERROR_UUID_RE = re.compile(
     r"\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b",
@@ -82,6 +113,37 @@ _STATS_CUMULATIVE_KEYS = frozenset({"jc", "jf", "jp", "ks"})
 Downsampling must not average these -- see _downsample_series."""
 
 
+def _json_dumps(payload: Any) -> bytes:
+    """Encode ``payload`` as UTF-8 JSON, with orjson when it is installed.
+
+    orjson writes ``bytes`` directly, so the body is not built as a ``str`` and re-encoded as
+    ``web.json_response`` does. Payloads orjson rejects (e.g. integers wider than 64 bits) fall back
+    to the standard library encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(payload).encode("utf-8")
+
+
+def _json_response(payload: Any, status: int = 200) -> web.Response:
+    """Return ``payload`` as a JSON response encoded by :func:`_json_dumps`."""
+    return web.Response(body=_json_dumps(payload), status=status, content_type="application/json")
+
+
+def _deflate_segment(data: bytes, level: int, final: bool) -> bytes:
+    """Raw-deflate ``data`` as an independent segment that can be concatenated with others.
+
+    Non-final segments end on a sync flush (byte-aligned, no final-block bit), so a run of them
+    followed by one final segment is a single valid deflate stream. That lets the static parts
+    of a response be compressed once and only the per-request part be compressed each time.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
 def _downsample_series(
     rows: list[dict[str, Any]],
     max_points: int,
@@ -251,9 +313,21 @@ _SETTINGS_SPEC: dict[str, dict[str, Any]] = {
 }
 
 
+_INDEX_SNAPSHOTS_PLACEHOLDER = "var _hordeSnapshots = [];"
+"""The statement in the index page's script that the server-side horde snapshots are injected into."""
+
+
 class WorkerWebUI:
     """Web UI server for displaying worker status and progress."""
 
+    _index_html_parts: tuple[bytes, bytes] | None = None
+    """The UTF-8 encoded index page before and after the snapshot placeholder, with the version filled in.
+    Built on the first page load; only the snapshot JSON is encoded per request after that."""
+
+    _index_html_gzip_parts: tuple[bytes, int, bytes] | None = None
+    """The deflated head (with its CRC-32) and tail of the index page, compressed once at the highest
+    level, so a gzip response only has to deflate the snapshot statement in between."""
+
     def __init__(
         self,
         port: int = 3000,
@@ -282,7 +356,7 @@ class WorkerWebUI:
         """
         self.port = port
         self.update_interval = update_interval
-        self.app = web.Application()
+        self.app = web.Application(middlewares=[self._status_cache_middleware])
         self.runner: web.AppRunner | None = None
         self.site: web.TCPSite | None = None
 
@@ -374,6 +448,10 @@ class WorkerWebUI:
             log_persisted_load(f"Persisted web UI data loaded in {_load_elapsed:.1f}s")
         self._load_persisted_settings()
 
+        # Uptime is measured against the monotonic clock so NTP steps can't skew it;
+        # session_start_time in status_data stays wall-clock for display only.
+        self._session_start_monotonic = time.monotonic()
+
         # Status data that will be updated by the worker
         self.status_data: dict[str, Any] = {
             "worker_name": "Unknown",
@@ -418,6 +496,7 @@ class WorkerWebUI:
             "last_image_model": "",
             "last_image_safety": [],
             "console_logs": [],
+            "console_logs_seq": 0,
             "faulted_jobs_history": [],
             "errors_history": [],
             "images_count": 0,
@@ -521,6 +600,24 @@ class WorkerWebUI:
         # Signature: (model_name: str, enabled: bool) -> None
         self._toggle_model_callback: Callable[[str, bool], None] | None = None
 
+        # Last /api/status body as (monotonic time it was encoded, JSON bytes, gzipped JSON bytes or None, ETag).
+        # Every open tab polls once per update_interval, so polls within the same interval share one encode.
+        self._status_payload_cache: tuple[float, bytes, bytes | None, str] | None = None
+
+        # Last brotli-compressed index page as (snapshot statement it was built with, future of the compressed
+        # body). Brotli output can't be spliced like the gzip parts, so the whole page is kept until the
+        # injected horde snapshots change. The future is stored before the compression finishes, so
+        # concurrent first loads wait for the same compression instead of each starting their own.
+        self._index_html_br: tuple[bytes, asyncio.Future[bytes]] | None = None
+
+        # /api/console_logs cursors below this get the whole window, because the logs were last
+        # replaced without a console_logs_seq to relate them to the previous list.
+        self._console_logs_min_since = 0
+
+        # Decoded bytes and ETag of each last image served by /api/last_image/{index}, by index.
+        # Filled on first request and dropped whenever update_status brings different images.
+        self._last_image_files: dict[int, tuple[bytes, str]] = {}
+
         self._setup_routes()
 
     # ------------------------------------------------------------------
@@ -1179,6 +1276,8 @@ class WorkerWebUI:
         self.app.router.add_get("/api/errors/grouped", self._handle_errors_grouped)
         self.app.router.add_post("/api/errors/clear", self._handle_errors_clear)
         self.app.router.add_get("/api/last_image", self._handle_last_image)
+        self.app.router.add_get("/api/last_image/{index}", self._handle_last_image_file)
+        self.app.router.add_get("/api/console_logs", self._handle_console_logs)
         self.app.router.add_get("/api/gallery", self._handle_gallery)
         self.app.router.add_get("/api/gallery/models", self._handle_gallery_models)
         self.app.router.add_get("/api/gallery/safety", self._handle_gallery_safety)
@@ -1201,10 +1300,25 @@ class WorkerWebUI:
         self.app.router.add_get("/api/horde-snapshots", self._handle_horde_snapshots)
         self.app.router.add_get("/api/horde-modes", self._handle_horde_modes)
 
+    @web.middleware
+    async def _status_cache_middleware(
+        self,
+        request: web.Request,
+        handler: Callable[[web.Request], Awaitable[web.StreamResponse]],
+    ) -> web.StreamResponse:
+        """Drop the cached /api/status body around any request that can change the status data."""
+        if request.method == "GET":
+            return await handler(request)
+        self._status_payload_cache = None
+        try:
+            return await handler(request)
+        finally:
+            self._status_payload_cache = None
+
     async def _handle_config(self, request: web.Request) -> web.Response:
         """Handle config API request."""
         # Return update interval in milliseconds for JavaScript
-        return web.json_response({"update_interval_ms": int(self.update_interval * 1000)})
+        return _json_response({"update_interval_ms": int(self.update_interval * 1000)})
 
     async def _handle_index(self, request: web.Request) -> web.Response:
         """Serve the main HTML page."""
@@ -1432,6 +1546,8 @@ class WorkerWebUI:
 
         .log-panel { width: 100%; height: min(800px, 80vh); overflow: hidden; }
         .console-container { background: #0c0c0c; border-radius: 8px; padding: 12px 14px; height: 100%; box-sizing: border-box; overflow-y: auto; font-family: ui-monospace, SFMono-Regular, Menlo, Monaco, Consolas, 'Liberation Mono', 'Courier New', monospace; font-size: 1rem; font-weight: 400; color: #cccccc; line-height: 1.2; }
+        /* Off-screen lines skip layout and paint; the remembered height keeps the scrollbar stable. */
+        .console-line { white-space: pre-wrap; word-break: break-word; content-visibility: auto; contain-intrinsic-size: auto 1.2em; }
         .console-pause-btn { margin-left: auto; background: #e2e8f0; color: #475569; border: none; border-radius: 6px; padding: 3px 10px; font-size: 0.75rem; font-weight: 600; cursor: pointer; transition: background 0.15s, color 0.15s; }
         .console-pause-btn:hover { background: #cbd5e1; }
         .console-pause-btn.paused { background: var(--accent); color: #fff; }
@@ -2576,9 +2692,13 @@ class WorkerWebUI:
     <script>
         function toggleSidebar() { document.getElementById('sidebar').classList.toggle('open'); document.getElementById('sidebar-overlay').classList.toggle('active'); }
         function closeSidebar() { document.getElementById('sidebar').classList.remove('open'); document.getElementById('sidebar-overlay').classList.remove('active'); }
+        const _HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+        const _HTML_ESCAPE_RE = /[&<>"']/g, _HTML_ESCAPE_TEST_RE = /[&<>"']/;
+        // One scan in the common case of nothing to escape, one replace pass otherwise
         function escapeHtml(str) {
             if (str === null || str === undefined) return '';
-            return String(str).replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;').replace(/"/g, '&quot;').replace(/'/g, '&#39;');
+            const s = String(str);
+            return _HTML_ESCAPE_TEST_RE.test(s) ? s.replace(_HTML_ESCAPE_RE, function(c) { return _HTML_ESCAPES[c]; }) : s;
         }
         const VALID_PAGES = Object.freeze(['overview', 'gallery', 'user', 'horde', 'stats', 'logs', 'settings', 'api', 'about']);
         let galleryCurrentPage = 1, galleryTotalPages = 1, galleryTotalImages = 0, galleryFetchInProgress = false;
@@ -2995,18 +3115,35 @@ class WorkerWebUI:
             else if (sa < 86400) { const h = Math.floor(sa/3600); return 'Last submission: '+h+' hour'+(h !== 1?'s':'')+' ago'; }
             else { const d = Math.floor(sa/86400); return 'Last submission: '+d+' day'+(d !== 1?'s':'')+' ago'; }
         }
+        // toLocale*String with options builds a new Intl formatter on every call, so the formatters are
+        // created once and the strings (immutable per timestamp) are memoized in a bounded Map.
+        const _TIME_FORMAT = new Intl.DateTimeFormat([], {hour: '2-digit', minute: '2-digit'});
+        const _DATE_FORMAT = new Intl.DateTimeFormat([], {year: 'numeric', month: 'short', day: 'numeric'});
+        const _TIMESTAMP_FORMAT_CACHE_MAX = 1000;
+        const _timestampFormatCache = new Map();
+        function _cachedTimestampFormat(key, format) {
+            let s = _timestampFormatCache.get(key);
+            if (s === undefined) {
+                s = format();
+                if (_timestampFormatCache.size >= _TIMESTAMP_FORMAT_CACHE_MAX) _timestampFormatCache.delete(_timestampFormatCache.keys().next().value);
+                _timestampFormatCache.set(key, s);
+            }
+            return s;
+        }
         function formatTimestamp(timestamp) {
             if (!timestamp || timestamp === 0) return '';
-            const d = new Date(timestamp * 1000);
-            return isNaN(d.getTime()) ? '' : d.toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
+            return _cachedTimestampFormat('t' + timestamp, function() {
+                const d = new Date(timestamp * 1000);
+                return isNaN(d.getTime()) ? '' : _TIME_FORMAT.format(d);
+            });
         }
         function formatTimestampFull(timestamp) {
             if (!timestamp || timestamp === 0) return '';
-            const d = new Date(timestamp * 1000);
-            if (isNaN(d.getTime())) return '';
-            const date = d.toLocaleDateString([], {year: 'numeric', month: 'short', day: 'numeric'});
-            const time = d.toLocaleTimeString([], {hour: '2-digit', minute: '2-digit'});
-            return date + ' · ' + time;
+            return _cachedTimestampFormat('f' + timestamp, function() {
+                const d = new Date(timestamp * 1000);
+                if (isNaN(d.getTime())) return '';
+                return _DATE_FORMAT.format(d) + ' · ' + _TIME_FORMAT.format(d);
+            });
         }
         function truncatePrompt(s, maxLen) {
             if (!s) return '';
@@ -3017,6 +3154,10 @@ class WorkerWebUI:
         const SCROLL_TOLERANCE_PX = 1;
         let consolePaused = false;
         let _consoleLogs = [];
+        // The raw lines currently in #console-logs, in order, or null when it shows the placeholder.
+        // Each poll resends a sliding window of the log buffer, so a render usually only drops lines
+        // from the top and appends the new ones instead of rebuilding the whole list.
+        let _consoleRenderedLogs = null;
         const _CONSOLE_LOG_LEVEL_RE = /^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\.\d+ \| ([A-Z]+)\s*\|/;
         const _CONSOLE_ANSI_RE = /\x1b\[[0-9;]*m/g;
         const _CONSOLE_LEVEL_ORDER = {TRACE: 0, DEBUG: 1, INFO: 2, SUCCESS: 3, WARNING: 4, ERROR: 5, CRITICAL: 6};
@@ -3036,19 +3177,75 @@ class WorkerWebUI:
                 return ord >= minOrder;
             });
             const atb = isScrolledToBottom(cl, SCROLL_TOLERANCE_PX);
-            var _LEVEL_COLORS = {WARNING:'#f59e0b',ERROR:'#ef4444',CRITICAL:'#dc2626',SUCCESS:'#23d18b',DEBUG:'#94a3b8',TRACE:'#64748b'};
-            if (visible.length > 0) {
-                cl.innerHTML = visible.map(function(log) {
-                    var lvl = _getLogLevel(log);
-                    var baseColor = _LEVEL_COLORS[lvl] || '#cccccc';
-                    return '<div style="white-space: pre-wrap; word-break: break-word; color:'+baseColor+';">'+ansiToHtml(log)+'</div>';
-                }).join('');
+            if (visible.length === 0) {
+                if (_consoleRenderedLogs !== null) {
+                    cl.innerHTML = '<div style="text-align:center;color:#475569;padding:18px;">No logs available</div>';
+                    _consoleRenderedLogs = null;
+                }
+                return;
+            }
+            const dropped = _consoleRenderedLogs === null ? -1 : _consoleLogOverlapStart(_consoleRenderedLogs, visible);
+            if (dropped < 0) {
+                cl.innerHTML = visible.map(_consoleLogLineHtml).join('');
             } else {
-                cl.innerHTML = '<div style="text-align:center;color:#475569;padding:18px;">No logs available</div>';
+                // Once the window is full every poll drops as many lines as it adds, so the dropped
+                // nodes are refilled and moved to the bottom rather than discarded and reallocated.
+                let next = _consoleRenderedLogs.length - dropped;
+                for (let i = 0; i < dropped; i++) {
+                    const node = cl.firstElementChild;
+                    if (next < visible.length) { _fillConsoleLine(node, visible[next++]); cl.appendChild(node); }
+                    else node.remove();
+                }
+                if (next < visible.length) cl.insertAdjacentHTML('beforeend', visible.slice(next).map(_consoleLogLineHtml).join(''));
             }
+            _consoleRenderedLogs = visible;
             if (atb) cl.scrollTop = cl.scrollHeight;
         }
+        const _CONSOLE_LEVEL_COLORS = {WARNING:'#f59e0b',ERROR:'#ef4444',CRITICAL:'#dc2626',SUCCESS:'#23d18b',DEBUG:'#94a3b8',TRACE:'#64748b'};
+        function _consoleLogLineHtml(log) {
+            const baseColor = _CONSOLE_LEVEL_COLORS[_getLogLevel(log)] || '#cccccc';
+            return '<div class="console-line" style="color:'+baseColor+';">'+ansiToHtml(log)+'</div>';
+        }
+        function _fillConsoleLine(node, log) {
+            node.style.color = _CONSOLE_LEVEL_COLORS[_getLogLevel(log)] || '#cccccc';
+            node.innerHTML = ansiToHtml(log);
+        }
+        // Returns how many leading lines of `rendered` to drop so that the rest is a prefix of `next`,
+        // or -1 if the two windows don't line up and the list has to be rebuilt.
+        function _consoleLogOverlapStart(rendered, next) {
+            for (let start = rendered.indexOf(next[0]); start !== -1; start = rendered.indexOf(next[0], start + 1)) {
+                const kept = rendered.length - start;
+                if (kept > next.length) continue;
+                let i = 0;
+                while (i < kept && rendered[start + i] === next[i]) i++;
+                if (i === kept) return start;
+            }
+            return -1;
+        }
         function applyConsoleFilter() { _renderConsoleLogs(); }
+        // Sequence number of the newest line in _consoleLogs. /api/status only carries the server's
+        // console_logs_seq; when it moves, just the lines past ours are fetched from /api/console_logs.
+        let _consoleLogsSeq = null, _consoleLogsFetchInFlight = false;
+        function fetchConsoleLogs(seq) {
+            if (_consoleLogsFetchInFlight || seq === _consoleLogsSeq) return;
+            _consoleLogsFetchInFlight = true;
+            fetch(_consoleLogsSeq === null ? '/api/console_logs' : '/api/console_logs?since=' + _consoleLogsSeq)
+                .then(r => { if (!r.ok) throw new Error('HTTP error! status: '+r.status); return r.json(); })
+                .then(res => {
+                    // Lines that arrive while paused are fetched again after resuming
+                    if (consolePaused) return;
+                    if (res.complete) {
+                        _consoleLogs = res.logs;
+                    } else {
+                        const merged = _consoleLogs.concat(res.logs);
+                        _consoleLogs = merged.slice(Math.max(0, merged.length - res.window));
+                    }
+                    _consoleLogsSeq = res.seq;
+                    _renderConsoleLogs();
+                })
+                .catch(err => console.error('Failed to fetch /api/console_logs:', err))
+                .finally(() => { _consoleLogsFetchInFlight = false; });
+        }
         function toggleConsolePause() {
             consolePaused = !consolePaused;
             const btn = document.getElementById('console-pause-btn');
@@ -3838,34 +4035,41 @@ class WorkerWebUI:
                 .catch(err => { console.error('Gallery safety fetch error:', err); });
         }
         function isScrolledToBottom(el, tol) { return el.scrollHeight - el.clientHeight <= el.scrollTop + tol; }
+        // VS Code / Windows Terminal "Campbell" palette - matches the default
+        // appearance most users will see in their standard console.
+        // Built once here rather than inside ansiToHtml, which runs for every console line.
+        const _ANSI_COLORS = {'30':'#0c0c0c','31':'#cd3131','32':'#0dbc79','33':'#e5e510','34':'#2472c8','35':'#bc3fbc','36':'#11a8cd','37':'#cccccc','90':'#666666','91':'#f14c4c','92':'#23d18b','93':'#f5f543','94':'#3b8eea','95':'#d670d6','96':'#29b8db','97':'#ffffff'};
+        const _ANSI_BG_COLORS = {'40':'#0c0c0c','41':'#cd3131','42':'#0dbc79','43':'#e5e510','44':'#2472c8','45':'#bc3fbc','46':'#11a8cd','47':'#cccccc','100':'#666666','101':'#f14c4c','102':'#23d18b','103':'#f5f543','104':'#3b8eea','105':'#d670d6','106':'#29b8db','107':'#ffffff'};
+        const _ANSI_BASE_CODES = ['30','31','32','33','34','35','36','37','90','91','92','93','94','95','96','97'];
+        const _ANSI_CUBE_LEVELS = [0, 95, 135, 175, 215, 255];
+        // Standard xterm 256-color palette (first 16 mirror the colors above; 16-231 form a
+        // 6x6x6 RGB cube; 232-255 are a grayscale ramp).
+        function _ansi256ToHex(n) {
+            if (n < 16) return _ANSI_COLORS[_ANSI_BASE_CODES[n]];
+            if (n >= 232) {
+                const v = 8 + (n - 232) * 10;
+                const h = v.toString(16).padStart(2, '0');
+                return '#' + h + h + h;
+            }
+            const i = n - 16;
+            const r = Math.floor(i / 36), g = Math.floor((i % 36) / 6), b = i % 6;
+            const toHex = v => v.toString(16).padStart(2, '0');
+            return '#' + toHex(_ANSI_CUBE_LEVELS[r]) + toHex(_ANSI_CUBE_LEVELS[g]) + toHex(_ANSI_CUBE_LEVELS[b]);
+        }
+        // Captures the parameter list of each SGR sequence, so split() alternates text and codes.
+        const _ANSI_SGR_SPLIT_RE = /\x1b\[([0-9;]+)m/;
         function ansiToHtml(text) {
             text = escapeHtml(text);
-            // VS Code / Windows Terminal "Campbell" palette - matches the default
-            // appearance most users will see in their standard console.
-            const colors = {'30':'#0c0c0c','31':'#cd3131','32':'#0dbc79','33':'#e5e510','34':'#2472c8','35':'#bc3fbc','36':'#11a8cd','37':'#cccccc','90':'#666666','91':'#f14c4c','92':'#23d18b','93':'#f5f543','94':'#3b8eea','95':'#d670d6','96':'#29b8db','97':'#ffffff'};
-            const bgColors = {'40':'#0c0c0c','41':'#cd3131','42':'#0dbc79','43':'#e5e510','44':'#2472c8','45':'#bc3fbc','46':'#11a8cd','47':'#cccccc','100':'#666666','101':'#f14c4c','102':'#23d18b','103':'#f5f543','104':'#3b8eea','105':'#d670d6','106':'#29b8db','107':'#ffffff'};
-            // Standard xterm 256-color palette (first 16 mirror the colors above; 16-231 form a
-            // 6x6x6 RGB cube; 232-255 are a grayscale ramp).
-            function ansi256ToHex(n) {
-                if (n < 16) {
-                    const base = ['30','31','32','33','34','35','36','37','90','91','92','93','94','95','96','97'];
-                    return colors[base[n]];
-                }
-                if (n >= 232) {
-                    const v = 8 + (n - 232) * 10;
-                    const h = v.toString(16).padStart(2, '0');
-                    return '#' + h + h + h;
-                }
-                const i = n - 16;
-                const r = Math.floor(i / 36), g = Math.floor((i % 36) / 6), b = i % 6;
-                const cube = [0, 95, 135, 175, 215, 255];
-                const toHex = v => v.toString(16).padStart(2, '0');
-                return '#' + toHex(cube[r]) + toHex(cube[g]) + toHex(cube[b]);
-            }
-            let result = '', cs = [];
-            const parts = text.split(/\x1b\[([0-9;]+)m/);
+            // Most console lines carry no escape codes at all; skip the tokenizer for them.
+            if (text.indexOf('\x1b') === -1) return text;
+            const out = [];
+            let cs = [];
+            const parts = text.split(_ANSI_SGR_SPLIT_RE);
             for (let i = 0; i < parts.length; i++) {
-                if (i % 2 === 0) { result += cs.length > 0 ? '<span style="'+cs.join(';')+'">'+parts[i]+'</span>' : parts[i]; }
+                if (i % 2 === 0) {
+                    if (parts[i] === '') continue;
+                    out.push(cs.length > 0 ? '<span style="'+cs.join(';')+'">'+parts[i]+'</span>' : parts[i]);
+                }
                 else {
                     const tokens = parts[i].split(';');
                     for (let j = 0; j < tokens.length; j++) {
@@ -3886,7 +4090,7 @@ class WorkerWebUI:
                             const mode = tokens[j + 1];
                             let hex = null;
                             if (mode === '5' && tokens[j + 2] !== undefined) {
-                                hex = ansi256ToHex(parseInt(tokens[j + 2], 10) || 0);
+                                hex = _ansi256ToHex(parseInt(tokens[j + 2], 10) || 0);
                                 j += 2;
                             } else if (mode === '2' && tokens[j + 4] !== undefined) {
                                 const r = parseInt(tokens[j + 2], 10) || 0;
@@ -3903,12 +4107,12 @@ class WorkerWebUI:
                                 else { cs = cs.filter(s => !s.startsWith('background-color:')); cs.push('background-color:'+hex); }
                             }
                         }
-                        else if (colors[c]) { cs = cs.filter(s => !s.startsWith('color:')); cs.push('color:'+colors[c]); }
-                        else if (bgColors[c]) { cs = cs.filter(s => !s.startsWith('background-color:')); cs.push('background-color:'+bgColors[c]); }
+                        else if (_ANSI_COLORS[c]) { cs = cs.filter(s => !s.startsWith('color:')); cs.push('color:'+_ANSI_COLORS[c]); }
+                        else if (_ANSI_BG_COLORS[c]) { cs = cs.filter(s => !s.startsWith('background-color:')); cs.push('background-color:'+_ANSI_BG_COLORS[c]); }
                     }
                 }
             }
-            return result;
+            return out.join('');
         }
         let statusAbortController = null, _lastImageFetchController = null, _lastImageFetchTimestamp = null, consecutiveErrors = 0;
         let statusUpdateTimestamp = Date.now(), updateIntervalMs = 1000, scheduledUpdateTimer = null;
@@ -3959,18 +4163,26 @@ class WorkerWebUI:
                 timeEl.textContent = labelTimestamp ? formatTimeAgo(labelTimestamp) : '';
             }
         }, 1000);
-        function _getImageKey(rawB64, timestamp, model, safety) {
-            if (!rawB64 || rawB64.length === 0) return 'empty';
+        function _getImageKey(srcs, timestamp, model, safety) {
+            if (!srcs || srcs.length === 0) return 'empty';
             // Use count + submission timestamp + model + safety flags as the change-detection key.
             // The first bytes of a PNG base64 string are always a fixed header, so sampling
             // from the beginning is not reliable. The timestamp changes whenever new images arrive.
             // model and safety are included so that badge/model-name updates with identical
             // image count/timestamp are not incorrectly skipped.
             const safetyKey = safety ? safety.map(function(s) { return (s && s.is_nsfw ? 'n' : '-') + (s && s.is_csam ? 'c' : '-'); }).join(',') : '';
-            return rawB64.length + ':' + (timestamp || 0) + ':' + (model || '') + ':' + safetyKey;
+            return srcs.length + ':' + (timestamp || 0) + ':' + (model || '') + ':' + safetyKey;
+        }
+        function _base64PngSrcs(b64arr) {
+            return b64arr.map(function(b) { return 'data:image/png;base64,' + b; });
         }
-        function renderLastImages(rawB64, oic, timestamp, model, safety) {
-            const key = _getImageKey(rawB64, timestamp, model, safety);
+        // The session's last images are loaded by URL as raw PNGs; the timestamp makes each new
+        // result a new URL so the browser never shows a previous one from its cache.
+        function _lastImageSrcs(count, timestamp) {
+            return Array.from({length: count}, function(_, i) { return '/api/last_image/' + i + '?v=' + encodeURIComponent(timestamp); });
+        }
+        function renderLastImages(allSrcs, oic, timestamp, model, safety) {
+            const key = _getImageKey(allSrcs, timestamp, model, safety);
             if (key === _lastRenderedImageKey) return;
             _lastRenderedImageKey = key;
             oic.classList.remove('loading');
@@ -3986,17 +4198,15 @@ class WorkerWebUI:
                 if (!isNsfw && !isCsam) return '';
                 return '<div class="image-flag-badges">'+(isCsam ? '<span class="image-flag-badge csam">CSAM</span>' : '')+(isNsfw ? '<span class="image-flag-badge nsfw">NSFW</span>' : '')+'</div>';
             }
-            if (!rawB64 || rawB64.length === 0) {
+            if (!allSrcs || allSrcs.length === 0) {
                 oic.removeAttribute('style');
                 oic.innerHTML = '<div class="empty-state"><span class="empty-state-icon">&#128444;</span>No image generated yet</div>';
                 if (modelEl) modelEl.textContent = '';
                 return;
             }
             if (modelEl) modelEl.textContent = (model && typeof model === 'string') ? model : '';
-            const previewB64 = rawB64.slice(0, 4);
-            const count = previewB64.length;
-            const srcs = previewB64.map(function(b) { return 'data:image/png;base64,' + b; });
-            const allSrcs = rawB64.map(function(b) { return 'data:image/png;base64,' + b; });
+            const srcs = allSrcs.slice(0, 4);
+            const count = srcs.length;
             function attachClicks() {
                 oic.querySelectorAll('img[data-fullsize]').forEach(function(img) {
                     img.onclick = function() { openImageOverlay(this.getAttribute('data-fullsize'), allSrcs, parseInt(this.getAttribute('data-idx') || '0', 10)); };
@@ -4119,7 +4329,7 @@ class WorkerWebUI:
             _lastImageFetchController = new AbortController();
             _lastImageFetchTimestamp = timestamp;
             const ctrl = _lastImageFetchController;
-            fetch('/api/last_image', { signal: ctrl.signal })
+            fetch('/api/last_image?include_base64=false', { signal: ctrl.signal })
                 .then(r => { if (!r.ok) throw new Error('HTTP error! status: '+r.status); return r.json(); })
                 .then(imgData => {
                     // Discard the response if a newer fetch has already superseded this one.
@@ -4135,7 +4345,7 @@ class WorkerWebUI:
                             : (Number.isFinite(_lastFetchedImageTimestamp) ? _lastFetchedImageTimestamp : 0);
                     }
                     _lastFetchedImageTimestamp = ts;
-                    renderLastImages(imgData.last_image_base64, document.getElementById('overview-image-container'), ts, imgData.last_image_model || null, imgData.last_image_safety || null);
+                    renderLastImages(_lastImageSrcs(imgData.last_image_count || 0, ts), document.getElementById('overview-image-container'), ts, imgData.last_image_model || null, imgData.last_image_safety || null);
                 })
                 .catch(function(err) {
                     if (err.name === 'AbortError') return;
@@ -4153,8 +4363,64 @@ class WorkerWebUI:
                     }
                 });
         }
+        // Process cards keyed by process id. The list rarely changes shape between polls, so the cards
+        // are kept and only text that actually changed is written, instead of rebuilding the markup.
+        const _processNodes = new Map();
+        function _createProcessNode() {
+            function el(tag, className, parent) {
+                const e = document.createElement(tag);
+                e.className = className;
+                parent.appendChild(e);
+                return e;
+            }
+            const root = document.createElement('div');
+            root.className = 'process-item';
+            const idRow = el('div', 'process-id-row', root);
+            return {
+                root: root,
+                id: el('span', 'process-id', idRow),
+                state: el('span', 'process-state-badge', idRow),
+                type: el('span', 'process-type-badge', idRow),
+                detail: el('div', 'process-detail-text', root),
+            };
+        }
+        function _setTextIfChanged(el, value) {
+            const text = value === null || value === undefined ? '' : String(value);
+            if (el.textContent !== text) el.textContent = text;
+        }
+        function _renderProcesses(pd, processes) {
+            if (processes.length === 0) {
+                if (_processNodes.size > 0 || !pd.querySelector('.empty-state')) {
+                    _processNodes.clear();
+                    pd.innerHTML = '<div class="empty-state"><span class="empty-state-icon">&#9881;</span>No process info</div>';
+                }
+                return;
+            }
+            if (_processNodes.size === 0) pd.textContent = '';
+            const seen = new Set();
+            processes.forEach(function(proc, i) {
+                const key = String(proc.id);
+                seen.add(key);
+                let node = _processNodes.get(key);
+                if (!node) { node = _createProcessNode(); _processNodes.set(key, node); }
+                let sl = [];
+                if (proc.job_id) sl.push('Job: '+proc.job_id);
+                if (proc.model) sl.push('Model: '+proc.model);
+                if (proc.progress!=null&&proc.progress!==undefined) sl.push('Progress: '+proc.progress+'%');
+                _setTextIfChanged(node.id, proc.display_id || proc.id);
+                _setTextIfChanged(node.state, proc.state);
+                _setTextIfChanged(node.type, proc.type);
+                _setTextIfChanged(node.detail, sl.length>0?sl.join(' | '):'Idle');
+                if (pd.children[i] !== node.root) pd.insertBefore(node.root, pd.children[i] || null);
+            });
+            _processNodes.forEach(function(node, key) {
+                if (!seen.has(key)) { node.root.remove(); _processNodes.delete(key); }
+            });
+        }
         function scheduleUpdate() {
             if (scheduledUpdateTimer !== null) return;
+            // Hidden tabs stop polling; the visibilitychange handler refreshes and resumes on return
+            if (document.hidden) return;
             const elapsed = Date.now() - statusUpdateTimestamp;
             const delay = Math.max(0, updateIntervalMs - elapsed);
             scheduledUpdateTimer = setTimeout(updateStatus, delay);
@@ -4166,6 +4432,9 @@ class WorkerWebUI:
             statusAbortController = new AbortController();
             fetch('/api/status', { signal: statusAbortController.signal })
                 .then(r => { if (!r.ok) throw new Error('HTTP error! status: '+r.status); return r.json(); })
+                // Apply the update at the start of the next frame so all of the writes below land in
+                // one style/layout pass. A tab hidden mid-request gets no frames, so it applies it straight away.
+                .then(data => document.hidden ? data : new Promise(resolve => requestAnimationFrame(() => resolve(data))))
                 .then(data => {
                     consecutiveErrors = 0;
                     document.getElementById('loading').style.display = 'none';
@@ -4379,15 +4648,7 @@ class WorkerWebUI:
                     } else { md.innerHTML = '<span style="color:#94a3b8;font-size:0.83rem;">No models loaded</span>'; }
                     const pd = document.getElementById('processes');
                     document.getElementById('process-count').textContent = data.processes.length;
-                    if (data.processes.length > 0) {
-                        pd.innerHTML = data.processes.map(proc => {
-                            let sl = [];
-                            if (proc.job_id) sl.push('Job: '+escapeHtml(proc.job_id));
-                            if (proc.model) sl.push('Model: '+escapeHtml(proc.model));
-                            if (proc.progress!=null&&proc.progress!==undefined) sl.push('Progress: '+escapeHtml(proc.progress)+'%');
-                            return '<div class="process-item"><div class="process-id-row"><span class="process-id">'+escapeHtml(proc.display_id || proc.id)+'</span><span class="process-state-badge">'+escapeHtml(proc.state)+'</span><span class="process-type-badge">'+escapeHtml(proc.type)+'</span></div><div class="process-detail-text">'+(sl.length>0?sl.join(' | '):'Idle')+'</div></div>';
-                        }).join('');
-                    } else { pd.innerHTML = '<div class="empty-state"><span class="empty-state-icon">&#9881;</span>No process info</div>'; }
+                    _renderProcesses(pd, data.processes);
                     const newImagesCount = data.images_count || 0;
                     const hasNewImages = lastKnownImagesCount >= 0 && newImagesCount > lastKnownImagesCount;
                     const galleryPageActive = document.getElementById('page-gallery').classList.contains('active');
@@ -4423,15 +4684,7 @@ class WorkerWebUI:
                             else fetchErrorsPage(errorsCurrentPage);
                         }
                     }
-                    const cl = document.getElementById('console-logs');
-                    if (!consolePaused) {
-                        if (data.console_logs && data.console_logs.length > 0) {
-                            _consoleLogs = data.console_logs;
-                        } else {
-                            _consoleLogs = [];
-                        }
-                        _renderConsoleLogs();
-                    }
+                    if (!consolePaused) fetchConsoleLogs(data.console_logs_seq);
                     // Update user page
                     const ud = data.user_details || {};
                     document.getElementById('user-page-username').textContent = data.horde_username || '-';
@@ -6080,7 +6333,10 @@ class WorkerWebUI:
                         { name: 'thumbnail_only', type: 'boolean', required: false, desc: 'If true, return only the thumbnail rather than the full-resolution image.' },
                     ] },
                     { method: 'GET', path: '/api/gallery/last-batch', desc: 'Full-resolution images from the most recently completed job (all outputs sharing one timestamp).' },
-                    { method: 'GET', path: '/api/last_image', desc: 'The last generated image(s) and their submission timestamp, kept separate from <code>/api/status</code> to keep that endpoint lightweight.' },
+                    { method: 'GET', path: '/api/last_image', desc: 'The last generated image(s) and their submission timestamp, kept separate from <code>/api/status</code> to keep that endpoint lightweight.', params: [
+                        { name: 'include_base64', type: 'boolean', required: false, desc: 'If false, omit the base64 images and load them from <code>/api/last_image/{index}</code> instead.' },
+                    ] },
+                    { method: 'GET', path: '/api/last_image/{index}', desc: 'One of the last generated images as raw PNG bytes, with an <code>ETag</code> for revalidation.' },
                 ],
             },
             {
@@ -6095,6 +6351,9 @@ class WorkerWebUI:
                         { name: 'page_size', type: 'integer', required: false, desc: 'Groups per page. Default 10, max 100.' },
                     ] },
                     { method: 'POST', path: '/api/errors/clear', desc: 'Clear all accumulated error history, including the persisted database log.' },
+                    { method: 'GET', path: '/api/console_logs', desc: 'Recent console log lines. <code>seq</code> numbers the newest line and is also reported as <code>console_logs_seq</code> by <code>/api/status</code>.', params: [
+                        { name: 'since', type: 'integer', required: false, desc: 'The <code>seq</code> the client already has. If still in the window, only newer lines are returned with <code>complete</code> false; otherwise the whole window is returned.' },
+                    ] },
                 ],
             },
             {
@@ -6703,7 +6962,7 @@ class WorkerWebUI:
         async function initializeUpdates() {
             // Fetch the last image immediately so the overview container shows it
             // before the first /api/status poll returns (~1 s later).
-            fetch('/api/last_image')
+            fetch('/api/last_image?include_base64=false')
                 .then(function(r) { return r.json(); })
                 .then(function(imgData) {
                     // Only skip if a real session image (ts > 0) has already been fetched.
@@ -6713,13 +6972,13 @@ class WorkerWebUI:
                     if (typeof ts !== 'number') ts = Number(ts);
                     if (!Number.isFinite(ts)) ts = 0;
                     _lastFetchedImageTimestamp = ts;
-                    var hasSessionImage = ts !== 0 && imgData.last_image_base64 && imgData.last_image_base64.length > 0;
+                    var hasSessionImage = ts !== 0 && imgData.last_image_count > 0;
                     if (hasSessionImage) {
                         // Set the label source immediately instead of waiting up to a
                         // second for the first /api/status poll to repeat the value.
                         _lastImageSubmissionTimestamp = ts;
                         renderLastImages(
-                            imgData.last_image_base64 || [],
+                            _lastImageSrcs(imgData.last_image_count, ts),
                             document.getElementById('overview-image-container'),
                             ts,
                             imgData.last_image_model || null,
@@ -6740,7 +6999,7 @@ class WorkerWebUI:
                                 var previewTs = Number(imgs[0].timestamp);
                                 _galleryPreviewTimestamp = (Number.isFinite(previewTs) && previewTs > 0) ? previewTs : null;
                                 renderLastImages(
-                                    b64arr,
+                                    _base64PngSrcs(b64arr),
                                     document.getElementById('overview-image-container'),
                                     imgs[0].timestamp,
                                     imgs[0].model || null,
@@ -6781,13 +7040,67 @@ class WorkerWebUI:
         # Downsampled the same way as the /api/horde-snapshots endpoint: this seed is sent
         # on every single page load regardless of whether the user ever opens the Horde
         # tab, so it must never scale with the full retention window's raw sample count.
+        index_html_parts = WorkerWebUI._index_html_parts
+        if index_html_parts is None:
+            head, _, tail = html.replace("{{WORKER_VERSION}}", horde_worker_regen.__version__).partition(
+                _INDEX_SNAPSHOTS_PLACEHOLDER,
+            )
+            index_html_parts = (head.encode("utf-8"), tail.encode("utf-8"))
+            WorkerWebUI._index_html_parts = index_html_parts
+        head_bytes, tail_bytes = index_html_parts
+
         snaps_json = json.dumps(_downsample_series(list(self._horde_snapshots), _CHART_MAX_POINTS))
-        html = html.replace(
-            "var _hordeSnapshots = [];",
-            f"var _hordeSnapshots = {snaps_json};",
+        snaps_statement = b"".join((b"var _hordeSnapshots = ", snaps_json.encode("utf-8"), b";"))
+        headers = {hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        accept_encoding = request.headers.get(hdrs.ACCEPT_ENCODING, "")
+        if brotli is not None and "br" in accept_encoding:
+            index_html_br = self._index_html_br
+            if index_html_br is None or index_html_br[0] != snaps_statement:
+                body = b"".join((head_bytes, snaps_statement, tail_bytes))
+                index_html_br = (
+                    snaps_statement,
+                    asyncio.get_running_loop().run_in_executor(
+                        None,
+                        lambda: brotli.compress(body, quality=_INDEX_BROTLI_QUALITY),
+                    ),
+                )
+                self._index_html_br = index_html_br
+            try:
+                # Shielded so a client disconnecting mid-compression doesn't cancel it for the other waiters
+                compressed_body = await asyncio.shield(index_html_br[1])
+            except Exception:
+                if self._index_html_br is index_html_br:
+                    self._index_html_br = None
+                raise
+            headers[hdrs.CONTENT_ENCODING] = "br"
+            return web.Response(body=compressed_body, content_type="text/html", charset="utf-8", headers=headers)
+        if "gzip" not in accept_encoding:
+            body = b"".join((head_bytes, snaps_statement, tail_bytes))
+            return web.Response(body=body, content_type="text/html", charset="utf-8", headers=headers)
+
+        index_html_gzip_parts = WorkerWebUI._index_html_gzip_parts
+        if index_html_gzip_parts is None:
+            index_html_gzip_parts = (
+                _deflate_segment(head_bytes, 9, final=False),
+                zlib.crc32(head_bytes),
+                _deflate_segment(tail_bytes, 9, final=True),
+            )
+            WorkerWebUI._index_html_gzip_parts = index_html_gzip_parts
+        head_deflated, head_crc, tail_deflated = index_html_gzip_parts
+
+        crc = zlib.crc32(tail_bytes, zlib.crc32(snaps_statement, head_crc))
+        size = len(head_bytes) + len(snaps_statement) + len(tail_bytes)
+        body = b"".join(
+            (
+                _GZIP_HEADER,
+                head_deflated,
+                _deflate_segment(snaps_statement, 1, final=False),
+                tail_deflated,
+                struct.pack("<II", crc, size & 0xFFFFFFFF),
+            ),
         )
-        html = html.replace("{{WORKER_VERSION}}", horde_worker_regen.__version__)
-        return web.Response(text=html, content_type="text/html")
+        headers[hdrs.CONTENT_ENCODING] = "gzip"
+        return web.Response(body=body, content_type="text/html", charset="utf-8", headers=headers)
 
     async def _handle_delete_worker(self, request: web.Request) -> web.Response:
         """Handle a request to delete an offline worker via the Horde API.
@@ -6937,19 +7250,45 @@ class WorkerWebUI:
     async def _handle_status(self, request: web.Request) -> web.Response:
         """Handle status API request.
 
-        Returns all status fields **except** last-image payload fields and the
-        full ``errors_history`` list so that large payloads are not included in
-        every poll. Clients should use ``last_image_submission_timestamp`` to
-        detect new images (fetch via ``/api/last_image``) and ``errors_count``
-        to detect new errors (fetch the relevant page via ``/api/errors``).
+        Returns all status fields **except** last-image payload fields, the
+        console log lines and the full ``errors_history`` list so that large
+        payloads are not included in every poll. Clients should use
+        ``last_image_submission_timestamp`` to detect new images (fetch via
+        ``/api/last_image``), ``console_logs_seq`` to detect new log lines (fetch
+        them via ``/api/console_logs``) and ``errors_count`` to detect new errors
+        (fetch the relevant page via ``/api/errors``).
+
+        The encoded body is reused for up to ``update_interval`` seconds (or until the status
+        changes) and carries an ``ETag``, so a poll with a matching ``If-None-Match`` gets an
+        empty 304. Large bodies are gzipped once per encode and sent as-is to clients that
+        accept gzip.
         """
-        payload = {
-            k: v
-            for k, v in self.status_data.items()
-            if k not in ("last_image_base64", "last_image_model", "last_image_safety", "errors_history")
-        }
-        payload["errors_count"] = len(self.status_data["errors_history"])
-        return web.json_response(payload)
+        now = time.monotonic()
+        cached = self._status_payload_cache
+        if cached is None or now - cached[0] >= self.update_interval:
+            payload = {
+                k: v
+                for k, v in self.status_data.items()
+                if k
+                not in ("last_image_base64", "last_image_model", "last_image_safety", "console_logs", "errors_history")
+            }
+            payload["errors_count"] = len(self.status_data["errors_history"])
+            # Derived at encode time so it keeps counting between update_status pushes
+            payload["uptime"] = now - self._session_start_monotonic
+            body = _json_dumps(payload)
+            gzipped_body = gzip.compress(body, compresslevel=1) if len(body) >= _STATUS_GZIP_MIN_BYTES else None
+            # Weak, since the same ETag covers both the identity and the gzip representation
+            cached = (now, body, gzipped_body, f'W/"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+            self._status_payload_cache = cached
+
+        _, body, gzipped_body, etag = cached
+        headers = {hdrs.ETAG: etag, hdrs.VARY: hdrs.ACCEPT_ENCODING}
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers=headers)
+        if gzipped_body is not None and "gzip" in request.headers.get(hdrs.ACCEPT_ENCODING, ""):
+            headers[hdrs.CONTENT_ENCODING] = "gzip"
+            body = gzipped_body
+        return web.Response(body=body, content_type="application/json", headers=headers)
 
     async def _handle_last_image(self, request: web.Request) -> web.Response:
         """Return only the last generated image(s) and their submission timestamp.
@@ -6958,19 +7297,60 @@ class WorkerWebUI:
         lightweight so the overview page loads quickly.  The client fetches this
         endpoint only when ``last_image_submission_timestamp`` changes, i.e. when
         a genuinely new image is available.
+
+        Query parameters:
+            include_base64: if "false"/"0", omit ``last_image_base64``. The images can then be
+                loaded by URL from ``/api/last_image/{index}`` for ``last_image_count`` indices.
         """
-        return web.json_response(
-            {
-                "last_image_base64": self.status_data["last_image_base64"],
-                "last_image_submission_timestamp": self.status_data["last_image_submission_timestamp"],
-                "last_image_model": self.status_data["last_image_model"],
-                "last_image_safety": self.status_data["last_image_safety"],
-            },
-        )
+        include_base64 = request.rel_url.query.get("include_base64", "").lower() not in ("0", "false", "no")
+        payload = {
+            "last_image_count": len(self.status_data["last_image_base64"]),
+            "last_image_submission_timestamp": self.status_data["last_image_submission_timestamp"],
+            "last_image_model": self.status_data["last_image_model"],
+            "last_image_safety": self.status_data["last_image_safety"],
+        }
+        if include_base64:
+            payload["last_image_base64"] = self.status_data["last_image_base64"]
+        return _json_response(payload)
+
+    @staticmethod
+    def _decode_last_image(encoded: str) -> tuple[bytes, str]:
+        """Decode a base64 last image and return its bytes with a strong ETag."""
+        png = binascii.a2b_base64(encoded)
+        return png, f'"{hashlib.blake2b(png, digest_size=8).hexdigest()}"'
+
+    async def _handle_last_image_file(self, request: web.Request) -> web.Response:
+        """Return one of the last generated images as raw PNG bytes.
+
+        The overview loads the images by URL instead of as base64 inside JSON, which is a third
+        smaller and lets the browser decode the PNG directly. Each image is decoded once per new
+        result and carries an ``ETag``, so a revalidating request gets an empty 304. Decoding a
+        multi-megabyte image runs in the executor so it doesn't stall the event loop.
+        """
+        images = self.status_data["last_image_base64"]
+        try:
+            index = int(request.match_info["index"])
+        except ValueError:
+            raise web.HTTPNotFound(reason="Last image not found") from None
+        if not 0 <= index < len(images):
+            raise web.HTTPNotFound(reason="Last image not found")
+        cached = self._last_image_files.get(index)
+        if cached is None:
+            encoded = images[index]
+            cached = await asyncio.get_running_loop().run_in_executor(None, self._decode_last_image, encoded)
+            # Only keep it if update_status didn't bring different images during the decode
+            current_images = self.status_data["last_image_base64"]
+            if index < len(current_images) and current_images[index] is encoded:
+                self._last_image_files[index] = cached
+        png, etag = cached
+        headers = {hdrs.ETAG: etag, hdrs.CACHE_CONTROL: "no-cache"}
+        if request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers=headers)
+        return web.Response(body=png, content_type="image/png", headers=headers)
 
     async def _handle_health(self, request: web.Request) -> web.Response:
         """Handle health check request."""
-        return web.json_response({"status": "ok"})
+        return web.Response(body=_HEALTH_BODY, content_type="application/json")
 
     async def _handle_stats(self, request: web.Request) -> web.Response:
         """Return historical statistics snapshots and per-model image counts.
@@ -7016,7 +7396,7 @@ class WorkerWebUI:
         """
         snapshots = _windowed_snapshots(list(self._stats_snapshots), request.query.get("window"))
         snapshots = _downsample_series(snapshots, _CHART_MAX_POINTS, _STATS_CUMULATIVE_KEYS)
-        return web.json_response({
+        return _json_response({
             "snapshots": snapshots,
             "images_per_model": self.status_data.get("images_per_model", {}),
             "failed_jobs_per_model": self.status_data.get("failed_jobs_per_model", {}),
@@ -7121,6 +7501,29 @@ class WorkerWebUI:
             self._prune_old_db_data()
 
 
+    async def _handle_console_logs(self, request: web.Request) -> web.Response:
+        """Return the console log lines newer than the client's cursor.
+
+        Query parameters:
+            since: the ``seq`` of the last line the client already has (optional)
+
+        ``seq`` numbers the newest line in the window. When ``since`` is still inside the window
+        only the newer lines are returned with ``complete`` false, for the client to append and
+        trim to ``window`` lines. Otherwise (no cursor, or one the window has moved past) the whole
+        window is returned with ``complete`` true and replaces what the client holds.
+        """
+        logs = self.status_data["console_logs"]
+        seq = self.status_data["console_logs_seq"]
+        try:
+            since: int | None = int(request.rel_url.query["since"])
+        except (KeyError, ValueError):
+            since = None
+        if since is None or since > seq or since < max(seq - len(logs), self._console_logs_min_since):
+            return _json_response({"seq": seq, "complete": True, "window": len(logs), "logs": logs})
+        return _json_response(
+            {"seq": seq, "complete": False, "window": len(logs), "logs": logs[len(logs) - (seq - since) :]},
+        )
+
     async def _handle_errors(self, request: web.Request) -> web.Response:
         """Return a paginated slice of the error history.
 
@@ -7141,7 +7544,7 @@ class WorkerWebUI:
         total_pages = max(1, math.ceil(total / page_size))
         page = min(page, total_pages)
         start = (page - 1) * page_size
-        return web.json_response(
+        return _json_response(
             {
                 "total": total,
                 "page": page,
@@ -7220,7 +7623,7 @@ class WorkerWebUI:
             }
             for key, cnt in groups[start : start + page_size]
         ]
-        return web.json_response(
+        return _json_response(
             {
                 "total_groups": total_groups,
                 "total_errors": total_errors,
@@ -7340,7 +7743,7 @@ class WorkerWebUI:
                 rendered.append(copied)
             page_images = rendered
 
-        return web.json_response(
+        return _json_response(
             {
                 "total": total,
                 "page": page,
@@ -7435,7 +7838,7 @@ class WorkerWebUI:
                     "is_csam": e.get("is_csam", False),
                 },
             )
-        return web.json_response({"images": result})
+        return _json_response({"images": result})
 
     async def _handle_gallery_image(self, request: web.Request) -> web.Response:
         """Return a single gallery image by its stable ``gallery_id``.
@@ -7500,7 +7903,7 @@ class WorkerWebUI:
             )
             if full_b64:
                 entry = {**entry, "base64": full_b64}
-        return web.json_response(entry)
+        return _json_response(entry)
 
     async def _handle_get_settings(self, request: web.Request) -> web.Response:
         """Return all runtime-configurable settings and their current values.
@@ -7935,7 +8338,7 @@ class WorkerWebUI:
         """
         snapshots = _windowed_snapshots(list(self._horde_snapshots), request.query.get("window"))
         snapshots = _downsample_series(snapshots, _CHART_MAX_POINTS)
-        return web.json_response({"snapshots": snapshots})
+        return _json_response({"snapshots": snapshots})
 
     async def _handle_horde_modes(self, request: web.Request) -> web.Response:
         """Return the last server-polled aihorde.net maintenance/invite-only mode flags.
@@ -8125,6 +8528,7 @@ class WorkerWebUI:
         Args:
             image_entry: dict with keys ``base64``, ``timestamp``, and ``model``.
         """
+        self._status_payload_cache = None
         entry = dict(image_entry)
         entry["gallery_id"] = self._next_gallery_id
         self._next_gallery_id += 1
@@ -8226,6 +8630,7 @@ class WorkerWebUI:
         last_image_model: str | None = None,
         last_image_safety: list[dict] | None = None,
         console_logs: list[str] | None = None,
+        console_logs_seq: int | None = None,
         faulted_jobs_history: list[dict[str, Any]] | None = None,
         errors_history: list[str] | None = None,
         user_details: dict[str, Any] | None = None,
@@ -8282,6 +8687,9 @@ class WorkerWebUI:
             last_image_model: Model name used to generate the last image
             last_image_safety: Per-image safety flags (is_nsfw, is_csam) for the last images
             console_logs: Recent console log messages
+            console_logs_seq: Number of console log lines captured so far, i.e. the sequence number of
+                the last entry in console_logs. Without it the new list can't be related to the previous
+                one, so clients are sent the whole window on their next fetch.
             faulted_jobs_history: List of faulted jobs with details
             errors_history: List of recent error messages
             user_details: Extended user details from the Horde API (worker_count, trusted, moderator, etc.)
@@ -8295,6 +8703,7 @@ class WorkerWebUI:
             avg_time_per_job_per_model: Average total job time per model this session
             max_time_per_job_per_model: Maximum total job time per model this session
         """
+        self._status_payload_cache = None
         if worker_name is not None:
             self.status_data["worker_name"] = worker_name
         if horde_username is not None:
@@ -8369,6 +8778,10 @@ class WorkerWebUI:
         if user_kudos_total is not None:
             self.status_data["user_kudos_total"] = user_kudos_total
         if last_image_base64 is not None:
+            # The worker resends the same list every tick; only different images invalidate the
+            # decoded files (cheap to check, as unchanged entries are the very same str objects)
+            if last_image_base64 != self.status_data["last_image_base64"]:
+                self._last_image_files.clear()
             self.status_data["last_image_base64"] = list(last_image_base64)
         if last_image_submission_timestamp is not None:
             self.status_data["last_image_submission_timestamp"] = last_image_submission_timestamp
@@ -8378,6 +8791,11 @@ class WorkerWebUI:
             self.status_data["last_image_safety"] = list(last_image_safety)
         if console_logs is not None:
             self.status_data["console_logs"] = console_logs
+            if console_logs_seq is None:
+                # Any new seq makes clients refetch, and min_since makes that fetch the whole window
+                console_logs_seq = self.status_data["console_logs_seq"] + 1
+                self._console_logs_min_since = console_logs_seq
+            self.status_data["console_logs_seq"] = console_logs_seq
         if faulted_jobs_history is not None:
             self.status_data["faulted_jobs_history"] = faulted_jobs_history
         if errors_history is not None:
@@ -8438,7 +8856,7 @@ class WorkerWebUI:
             self.status_data["max_time_per_job_per_model"] = dict(max_time_per_job_per_model)
 
         # Update uptime
-        self.status_data["uptime"] = time.time() - self.status_data["session_start_time"]
+        self.status_data["uptime"] = time.monotonic() - self._session_start_monotonic
 
         # Record a statistics snapshot (throttled to at most once per _stats_snapshot_interval).
         self._record_stats_snapshot()
@@ -8451,13 +8869,15 @@ class WorkerWebUI:
         uptime of the old session during the brief shutdown window before the process
         is actually replaced via ``os.execv``.
         """
+        self._session_start_monotonic = time.monotonic()
         self.status_data["session_start_time"] = time.time()
         self.status_data["uptime"] = 0.0
 
     async def start(self) -> None:
         """Start the web server."""
         try:
-            self.runner = web.AppRunner(self.app)
+            # No access log: every open tab polls /api/status each update_interval, and the lines are never read
+            self.runner = web.AppRunner(self.app, access_log=None)
             await self.runner.setup()
             self.site = web.TCPSite(self.runner, "0.0.0.0", self.port)
             await self.site.start()
@@ -1,7 +1,8 @@
 """Tests for configure_logger_format file-logging behaviour."""
 
+import io
 import sys
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from pathlib import Path
 
 import pytest
@@ -32,12 +33,21 @@ def _webui_info(message: str) -> None:
     logger.patch(lambda r: r.update(name="horde_worker_regen.webui.server")).info(message)
 
 
+_BUILTIN_LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+
+
 @pytest.fixture(autouse=True)
 def _restore_logger() -> Generator[None, None, None]:
-    """Remove all loguru handlers added during the test and restore the default handler."""
+    """Remove all loguru handlers added during the test and restore the default handler.
+
+    ``register_level_colors`` changes loguru's global level colors, so those are restored too.
+    """
+    level_colors = {name: logger.level(name).color for name in _BUILTIN_LEVELS}
     logger.remove()
     yield
     logger.remove()
+    for name, color in level_colors.items():
+        logger.level(name, color=color)
     # Restore a basic stderr sink so other tests are not affected
     logger.add(sys.stderr)
 
@@ -286,3 +296,310 @@ class TestConfigureLoggerFormatFileLogging:
         assert len(parts) >= 4, f"Log line should have 4 '|'-separated fields, got: {log_line!r}"
         location_field = parts[2]
         assert ":" in location_field, f"Location field should be 'module:function:line', got: {location_field!r}"
+
+
+class TestConsoleFormat:
+    """Verify the static console format string and its registered level colors."""
+
+    def test_level_format_is_static_string(self) -> None:
+        """The console format should be a template string, not a per-record callback."""
+        import horde_worker_regen.logger_config as mod
+
+        fmt = mod.create_level_format(time_format="HH:mm")
+        assert isinstance(fmt, str)
+        assert fmt.startswith("{time:HH:mm}")
+        assert fmt.endswith("</level> <dim>|</dim> {message}")
+
+    def test_registered_colors_are_applied(self) -> None:
+        """Records should be colored with the color registered for their level."""
+        import horde_worker_regen.logger_config as mod
+
+        mod.register_level_colors()
+        lines: list[str] = []
+        logger.add(lines.append, format=mod.create_level_format(), colorize=True)
+        logger.info("colored info")
+        logger.error("colored error")
+
+        assert "\x1b[1;36mINFO    \x1b[0m" in lines[0] and "colored info" in lines[0]
+        assert "\x1b[1;31mERROR   \x1b[0m" in lines[1] and "colored error" in lines[1]
+        assert all(line.endswith(" colored info\n") or line.endswith(" colored error\n") for line in lines)
+
+    def test_message_body_is_uncolored_at_every_level(self) -> None:
+        """Only the level field is colored; warning and error bodies are plain text too."""
+        import horde_worker_regen.logger_config as mod
+
+        mod.register_level_colors()
+        lines: list[str] = []
+        logger.add(lines.append, format=mod.create_level_format(), colorize=True, level="TRACE")
+        for level in ("TRACE", "SUCCESS", "WARNING", "ERROR", "CRITICAL"):
+            logger.log(level, "plain body")
+
+        assert len(lines) == 5
+        assert all(line.endswith("\x1b[0m plain body\n") for line in lines)
+
+    def test_critical_level_is_underlined(self) -> None:
+        """CRITICAL should keep its bold, dark red, underlined level indicator."""
+        import horde_worker_regen.logger_config as mod
+
+        assert mod._LEVEL_COLORS["CRITICAL"] == "\x1b[1;38;2;139;0;0;4m"
+
+    def test_merge_sgr_emits_single_escape(self) -> None:
+        """Combined styles should collapse into one SGR sequence."""
+        import horde_worker_regen.logger_config as mod
+
+        merged = mod._merge_sgr(("bold", "fg #00d7ff"))
+        assert merged == "\x1b[1;38;2;0;215;255m"
+        assert merged.count("\x1b[") == 1
+
+    def test_level_indicator_has_one_escape_per_styled_region(self) -> None:
+        """Each <level> region should open with exactly one escape sequence."""
+        import horde_worker_regen.logger_config as mod
+
+        mod.register_level_colors()
+        lines: list[str] = []
+        logger.add(lines.append, format="<level>{level: <8}</level>", colorize=True)
+        logger.critical("x")
+
+        assert lines[0].count("\x1b[") == 2  # one opening sequence, one reset
+
+
+class TestBufferedConsoleSink:
+    """Verify the batching behaviour of the buffered stderr console sink."""
+
+    @staticmethod
+    def _make_stream() -> io.TextIOWrapper:
+        return io.TextIOWrapper(io.BytesIO(), encoding="utf-8")
+
+    @staticmethod
+    def _only(test_name: str) -> Callable[[dict], bool]:
+        """Return a filter passing only records bound with ``test=test_name``, so stray records don't leak in."""
+        return lambda record: record["extra"].get("test") == test_name
+
+    def test_info_is_buffered_until_flush(self) -> None:
+        """INFO records should not reach the stream until the buffer is flushed."""
+        import horde_worker_regen.logger_config as mod
+
+        stream = self._make_stream()
+        sink = mod._BufferedConsoleSink(stream, flush_level_no=logger.level("WARNING").no, flush_interval=60)
+        handler_id = logger.add(sink, format="{message}", filter=self._only("buffered"))
+        try:
+            logger.bind(test="buffered").info("buffered line")
+
+            assert stream.buffer.getvalue() == b""
+            sink.flush()
+            assert stream.buffer.getvalue() == b"buffered line\n"
+        finally:
+            logger.remove(handler_id)
+            sink.close()
+
+    def test_warning_flushes_immediately(self) -> None:
+        """WARNING and above should flush everything buffered so far."""
+        import horde_worker_regen.logger_config as mod
+
+        stream = self._make_stream()
+        sink = mod._BufferedConsoleSink(stream, flush_level_no=logger.level("WARNING").no, flush_interval=60)
+        handler_id = logger.add(sink, format="{message}", filter=self._only("warning"))
+        try:
+            test_logger = logger.bind(test="warning")
+            test_logger.info("first")
+            test_logger.warning("second")
+
+            assert stream.buffer.getvalue() == b"first\nsecond\n"
+        finally:
+            logger.remove(handler_id)
+            sink.close()
+
+    def test_buffer_is_flushed_after_interval(self) -> None:
+        """A quiet buffer should be written out by the flusher thread."""
+        import time
+
+        import horde_worker_regen.logger_config as mod
+
+        stream = self._make_stream()
+        sink = mod._BufferedConsoleSink(stream, flush_level_no=logger.level("WARNING").no, flush_interval=0.01)
+        handler_id = logger.add(sink, format="{message}", filter=self._only("flush"))
+        try:
+            logger.bind(test="flush").info("timed")
+
+            deadline = time.monotonic() + 2
+            while stream.buffer.getvalue() == b"" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert stream.buffer.getvalue() == b"timed\n"
+        finally:
+            logger.remove(handler_id)
+            sink.close()
+
+    def test_one_flusher_thread_serves_every_interval(self) -> None:
+        """Successive flush windows should reuse one thread, which close() stops."""
+        import time
+
+        import horde_worker_regen.logger_config as mod
+
+        stream = self._make_stream()
+        sink = mod._BufferedConsoleSink(stream, flush_level_no=logger.level("WARNING").no, flush_interval=0.01)
+        handler_id = logger.add(sink, format="{message}", filter=self._only("thread"))
+        try:
+            test_logger = logger.bind(test="thread")
+            test_logger.info("first")
+            flusher = sink._flusher
+            assert flusher is not None
+
+            deadline = time.monotonic() + 2
+            while stream.buffer.getvalue() == b"" and time.monotonic() < deadline:
+                time.sleep(0.01)
+            test_logger.info("second")
+            assert sink._flusher is flusher
+        finally:
+            logger.remove(handler_id)
+            sink.close()
+
+        assert not flusher.is_alive()
+        assert stream.buffer.getvalue() == b"first\nsecond\n"
+
+    def test_flushes_when_full(self) -> None:
+        """Reaching the buffer size should write everything out in one chunk."""
+        import horde_worker_regen.logger_config as mod
+
+        class _Message(str):
+            """Stand-in for loguru's message object: the formatted text plus its record."""
+
+            record: dict
+
+        def _info(text: str) -> _Message:
+            message = _Message(text)
+            message.record = {"level": logger.level("INFO")}
+            return message
+
+        stream = self._make_stream()
+        sink = mod._BufferedConsoleSink(
+            stream, flush_level_no=logger.level("WARNING").no, buffer_size=16, flush_interval=60
+        )
+        sink(_info("short\n"))
+        assert stream.buffer.getvalue() == b""
+
+        sink(_info("long enough to fill\n"))
+        assert stream.buffer.getvalue() == b"short\nlong enough to fill\n"
+
+    def test_console_sink_buffers_in_front_of_rewriter(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A rewriter-wrapped stderr should get a buffered sink that applies its rewrite()."""
+        import horde_worker_regen.logger_config as mod
+
+        class _Rewriter(io.StringIO):
+            def __init__(self, original_iostream: io.TextIOWrapper) -> None:
+                super().__init__()
+                self.original_iostream = original_iostream
+
+            def rewrite(self, message: str) -> str:
+                return message.replace("horde_worker_regen.", "")
+
+        stream = self._make_stream()
+        monkeypatch.setattr(sys, "stderr", _Rewriter(stream))
+        sink = mod._make_console_sink(logger.level("WARNING").no)
+        assert isinstance(sink, mod._BufferedConsoleSink)
+
+        handler_id = logger.add(sink, format="{message}", filter=self._only("rewriter"))
+        try:
+            logger.bind(test="rewriter").warning("horde_worker_regen.module")
+            assert stream.buffer.getvalue() == b"module\n"
+        finally:
+            logger.remove(handler_id)
+            sink.close()
+
+
+def test_file_format_ends_each_record_with_single_newline(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """The static file format should not leave blank lines between records."""
+    import horde_worker_regen.logger_config as mod
+
+    monkeypatch.setattr(mod, "_LOGS_DIR", tmp_path)
+    monkeypatch.delenv("AIWORKER_LOG_LEVEL", raising=False)
+    monkeypatch.delenv("AIWORKER_DEBUG", raising=False)
+
+    mod.configure_logger_format(process_id=3, enable_stderr=False)
+    logger.info("first record")
+    logger.info("second record")
+    logger.complete()
+
+    bridge_log = _find_log(tmp_path, "bridge", "bridge_3.log")
+    assert bridge_log is not None
+    assert "" not in bridge_log.read_text(encoding="utf-8").splitlines()
+
+
+class TestResolveLogLevel:
+    """Verify the environment-driven log level selection."""
+
+    def test_defaults_to_info(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """No environment overrides should select INFO."""
+        import horde_worker_regen.logger_config as mod
+
+        monkeypatch.delenv("AIWORKER_LOG_LEVEL", raising=False)
+        monkeypatch.delenv("AIWORKER_DEBUG", raising=False)
+        assert mod._resolve_log_level() == "INFO"
+
+    def test_invalid_level_falls_back_to_info(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """An unknown AIWORKER_LOG_LEVEL should fall back to INFO."""
+        import horde_worker_regen.logger_config as mod
+
+        monkeypatch.setenv("AIWORKER_LOG_LEVEL", "verbose")
+        monkeypatch.delenv("AIWORKER_DEBUG", raising=False)
+        assert mod._resolve_log_level() == "INFO"
+
+    def test_debug_flag_overrides_level(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """The legacy AIWORKER_DEBUG flag should force DEBUG."""
+        import horde_worker_regen.logger_config as mod
+
+        monkeypatch.setenv("AIWORKER_LOG_LEVEL", "warning")
+        monkeypatch.setenv("AIWORKER_DEBUG", "True")
+        assert mod._resolve_log_level() == "DEBUG"
+
+
+class TestConsoleFormatSelection:
+    """Verify the console format follows whether stderr is a terminal."""
+
+    def test_logfmt_format_has_no_markup(self) -> None:
+        """The non-TTY console format should be plain key=value fields."""
+        import horde_worker_regen.logger_config as mod
+
+        lines: list[str] = []
+        logger.add(lines.append, format=mod.create_logfmt_format(time_format="HH:mm"), colorize=False)
+        logger.opt(colors=True).info("<b>ready</b>")
+
+        assert "\x1b[" not in lines[0] and "<b>" not in lines[0]
+        assert lines[0].endswith(' level=INFO msg="ready"\n')
+
+    def test_logfmt_message_is_quoted_and_escaped(self) -> None:
+        """Spaces, '=', quotes, backslashes and line breaks should stay inside one quoted msg value."""
+        import horde_worker_regen.logger_config as mod
+
+        lines: list[str] = []
+        logger.add(lines.append, format=mod.create_logfmt_format(time_format="HH:mm"), colorize=False)
+        logger.info('key=value say "hi" C:\\dir\nsecond line')
+
+        assert len(lines) == 1
+        assert lines[0].startswith('time="')
+        assert lines[0].endswith(' level=INFO msg="key=value say \\"hi\\" C:\\\\dir\\nsecond line"\n')
+
+    def test_non_tty_console_is_not_colorized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Piped stderr should not be reported as a colorized console."""
+        import horde_worker_regen.logger_config as mod
+
+        monkeypatch.setattr(mod, "_LOGS_DIR", tmp_path)
+        monkeypatch.setattr(mod, "_stderr_is_tty", lambda: False)
+        mod.configure_logger_format(process_id=4)
+        assert mod.console_colorized() is False
+
+    def test_tty_console_is_colorized(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """A terminal stderr should keep the colored console format."""
+        import horde_worker_regen.logger_config as mod
+
+        stream = io.StringIO()
+        monkeypatch.setattr(stream, "isatty", lambda: True)
+        monkeypatch.setattr(sys, "stderr", stream)
+        monkeypatch.setattr(sys, "__stderr__", stream)
+        monkeypatch.setattr(mod, "_LOGS_DIR", tmp_path)
+        mod.configure_logger_format(process_id=4)
+        logger.warning("colored warning")
+        logger.complete()
+        logger.remove()
+
+        assert mod.console_colorized() is True
+        assert "\x1b[1;33mWARNING \x1b[0m" in stream.getvalue()
@@ -0,0 +1,493 @@
+"""Tests for the safety process job handler."""
+
+import base64
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from PIL import Image
+
+from horde_worker_regen.process_management import safety_process as safety_process_module
+from horde_worker_regen.process_management.messages import (
+    HordeControlFlag,
+    HordeSafetyControlMessage,
+    HordeSafetyResultMessage,
+)
+from horde_worker_regen.process_management.safety_process import HordeSafetyProcess
+
+
+def _png_base64(color: tuple[int, int, int] = (0, 0, 0)) -> str:
+    """Return a small base64 encoded PNG."""
+    buffer = BytesIO()
+    Image.new("RGB", (8, 8), color).save(buffer, "png")
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def _make_safety_process() -> HordeSafetyProcess:
+    """Create a safety process without loading any models."""
+    process = HordeSafetyProcess.__new__(HordeSafetyProcess)
+    process.process_id = 1
+    process.process_launch_identifier = 1
+    process.process_message_queue = MagicMock()
+    process._io_pool = ThreadPoolExecutor(max_workers=2)
+    process._nsfw_result_cache = safety_process_module.OrderedDict()
+    process._nsfw_checker = MagicMock()
+    process._nsfw_checker.check_for_nsfw.return_value = MagicMock(is_nsfw=False, is_csam=False)
+    process._censor_images_base64 = {reason: reason.name.lower() for reason in safety_process_module.CensorReason}
+    return process
+
+
+def _make_message(images_base64: list[str]) -> HordeSafetyControlMessage:
+    return HordeSafetyControlMessage(
+        control_flag=HordeControlFlag.EVALUATE_SAFETY,
+        job_id="00000000-0000-0000-0000-000000000000",
+        prompt="a cat###blurry",
+        censor_nsfw=False,
+        sfw_worker=False,
+        images_base64=images_base64,
+        horde_model_info={},
+    )
+
+
+def _get_result(process: HordeSafetyProcess) -> HordeSafetyResultMessage:
+    results = [
+        c.args[0]
+        for c in process.process_message_queue.put.call_args_list
+        if isinstance(c.args[0], HordeSafetyResultMessage)
+    ]
+    assert len(results) == 1
+    return results[0]
+
+
+@pytest.fixture(autouse=True)
+def _no_output_directory(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Prevent the handler from creating the /output tree."""
+
+    def _fail(*args: object, **kwargs: object) -> None:
+        raise OSError("read-only")
+
+    monkeypatch.setattr(safety_process_module.os, "makedirs", _fail)
+
+
+class TestBatchedImageFeatures:
+    """The CLIP image features for a job are encoded once and handed to the checker per image."""
+
+    def test_features_are_passed_to_checker_in_order(self) -> None:
+        process = _make_safety_process()
+        features = ["features-0", "features-1"]
+        process._batch_image_features = MagicMock(return_value=features)
+
+        process._receive_and_handle_control_message(
+            _make_message([_png_base64((255, 0, 0)), _png_base64((0, 255, 0))]),
+        )
+
+        process._batch_image_features.assert_called_once()
+        assert len(process._batch_image_features.call_args.args[0]) == 2
+        tensors = [c.kwargs["image_tensor"] for c in process._nsfw_checker.check_for_nsfw.call_args_list]
+        assert tensors == features
+
+    def test_undecodable_image_keeps_result_order(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=["features-0", "features-2"])
+
+        process._receive_and_handle_control_message(
+            _make_message(
+                [_png_base64((255, 0, 0)), base64.b64encode(b"not a png").decode(), _png_base64((0, 255, 0))],
+            ),
+        )
+
+        assert len(process._batch_image_features.call_args.args[0]) == 2
+        tensors = [c.kwargs["image_tensor"] for c in process._nsfw_checker.check_for_nsfw.call_args_list]
+        assert tensors == ["features-0", "features-2"]
+
+        evaluations = _get_result(process).safety_evaluations
+        assert [evaluation.failed for evaluation in evaluations] == [False, True, False]
+
+    def test_images_are_decoded_and_encoded_per_batch(self) -> None:
+        process = _make_safety_process()
+        process._batch_size = 2
+        process._batch_image_features = MagicMock(side_effect=[["features-0", "features-1"], ["features-2"]])
+
+        process._receive_and_handle_control_message(
+            _make_message([_png_base64((255, 0, 0)), _png_base64((0, 255, 0)), _png_base64((0, 0, 255))]),
+        )
+
+        assert [len(c.args[0]) for c in process._batch_image_features.call_args_list] == [2, 1]
+        tensors = [c.kwargs["image_tensor"] for c in process._nsfw_checker.check_for_nsfw.call_args_list]
+        assert tensors == ["features-0", "features-1", "features-2"]
+
+    def test_batch_failure_falls_back_to_per_image_encoding(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+
+        process._receive_and_handle_control_message(_make_message([_png_base64()]))
+
+        check_call = process._nsfw_checker.check_for_nsfw.call_args
+        assert check_call.kwargs["image_tensor"] is None
+        assert not _get_result(process).safety_evaluations[0].failed
+
+    def test_batch_encode_returns_none_without_clip(self) -> None:
+        process = _make_safety_process()
+        process._interrogator = MagicMock()
+        process._interrogator.clip_preprocess.side_effect = RuntimeError("no clip")
+
+        assert process._batch_image_features([Image.new("RGB", (8, 8))]) is None
+        assert process._batch_image_features([]) is None
+
+    def test_batch_size_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("AIWORKER_SAFETY_BATCH_SIZE", "3")
+
+        assert HordeSafetyProcess._get_batch_size() == 3
+
+    @pytest.mark.parametrize("env_val", ["0", "-2", "lots"])
+    def test_invalid_batch_size_uses_default(self, monkeypatch: pytest.MonkeyPatch, env_val: str) -> None:
+        monkeypatch.setenv("AIWORKER_SAFETY_BATCH_SIZE", env_val)
+
+        assert HordeSafetyProcess._get_batch_size() == safety_process_module._DEFAULT_SAFETY_BATCH_SIZE
+
+
+class TestNsfwResultCache:
+    """Byte-identical images with the same prompt and model reuse the previous verdict."""
+
+    def test_identical_image_skips_the_checker(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        image_base64 = _png_base64((1, 2, 3))
+
+        process._receive_and_handle_control_message(_make_message([image_base64]))
+        process._receive_and_handle_control_message(_make_message([image_base64]))
+
+        assert process._nsfw_checker.check_for_nsfw.call_count == 1
+        assert process._batch_image_features.call_args.args[0] == []
+
+    def test_cache_hit_skips_the_batched_encode(self) -> None:
+        process = _make_safety_process()
+        process._interrogator = MagicMock()
+        process._interrogator.clip_preprocess.side_effect = RuntimeError("no clip")
+        image_base64 = _png_base64((1, 2, 3))
+
+        process._receive_and_handle_control_message(_make_message([image_base64]))
+        process._interrogator.reset_mock()
+        process._nsfw_checker.check_for_nsfw.reset_mock()
+        process._receive_and_handle_control_message(_make_message([image_base64]))
+
+        process._nsfw_checker.check_for_nsfw.assert_not_called()
+        process._interrogator._prepare_clip.assert_not_called()
+        process._interrogator.clip_preprocess.assert_not_called()
+        process._interrogator.clip_model.encode_image.assert_not_called()
+
+    def test_least_recently_used_verdict_is_evicted(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(safety_process_module, "_NSFW_RESULT_CACHE_SIZE", 2)
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        image_a, image_b, image_c = (_png_base64((value, 0, 0)) for value in (1, 2, 3))
+
+        for image_base64 in (image_a, image_b, image_a, image_c):
+            process._receive_and_handle_control_message(_make_message([image_base64]))
+
+        assert len(process._nsfw_result_cache) == 2
+        assert process._nsfw_checker.check_for_nsfw.call_count == 3
+
+        # `image_a` was used more recently than `image_b`, so `image_b` was the one evicted for `image_c`
+        process._receive_and_handle_control_message(_make_message([image_a]))
+        assert process._nsfw_checker.check_for_nsfw.call_count == 3
+        process._receive_and_handle_control_message(_make_message([image_b]))
+        assert process._nsfw_checker.check_for_nsfw.call_count == 4
+
+    def test_different_prompt_is_checked_again(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        image_base64 = _png_base64((1, 2, 3))
+        other_prompt = _make_message([image_base64])
+        other_prompt.prompt = "a dog"
+
+        process._receive_and_handle_control_message(_make_message([image_base64]))
+        process._receive_and_handle_control_message(other_prompt)
+
+        assert process._nsfw_checker.check_for_nsfw.call_count == 2
+
+    def test_duplicate_within_a_job_keeps_feature_order(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=["features-0", "features-1", "features-2"])
+        duplicate = _png_base64((1, 2, 3))
+
+        process._receive_and_handle_control_message(_make_message([duplicate, duplicate, _png_base64((4, 5, 6))]))
+
+        tensors = [c.kwargs["image_tensor"] for c in process._nsfw_checker.check_for_nsfw.call_args_list]
+        assert tensors == ["features-0", "features-2"]
+
+
+class TestGpuPrecision:
+    """`AIWORKER_SAFETY_PRECISION` controls whether the safety model weights are halved on GPU."""
+
+    def _make_process_with_models(self) -> HordeSafetyProcess:
+        process = _make_safety_process()
+        process._deep_danbooru_model = MagicMock()
+        process._interrogator = MagicMock()
+        return process
+
+    def test_fp32_keeps_weights(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("AIWORKER_SAFETY_PRECISION", "fp32")
+        process = self._make_process_with_models()
+
+        process._configure_gpu_precision()
+
+        process._deep_danbooru_model.half.assert_not_called()
+        process._interrogator.clip_model.half.assert_not_called()
+
+    def test_invalid_value_does_not_raise(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("AIWORKER_SAFETY_PRECISION", "int4")
+        process = self._make_process_with_models()
+
+        process._configure_gpu_precision()
+
+    def test_cpu_thread_count_from_env(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        torch = pytest.importorskip("torch")
+        set_num_threads = MagicMock()
+        monkeypatch.setattr(torch, "set_num_threads", set_num_threads)
+        monkeypatch.setenv("AIWORKER_SAFETY_THREADS", "3")
+
+        HordeSafetyProcess._configure_cpu_threads()
+
+        set_num_threads.assert_called_once_with(3)
+
+    def test_invalid_cpu_thread_count_uses_default(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        torch = pytest.importorskip("torch")
+        set_num_threads = MagicMock()
+        monkeypatch.setattr(torch, "set_num_threads", set_num_threads)
+        monkeypatch.setattr(safety_process_module.os, "cpu_count", lambda: 8)
+        monkeypatch.setenv("AIWORKER_SAFETY_THREADS", "none")
+
+        HordeSafetyProcess._configure_cpu_threads()
+
+        set_num_threads.assert_called_once_with(4)
+
+    def test_int8_quantization_failure_does_not_raise(self) -> None:
+        process = self._make_process_with_models()
+
+        # MagicMock models are not torch modules, so quantization fails and is only logged
+        process._quantize_for_cpu()
+
+
+class TestSaveImage:
+    """Saved PNGs are written from the IO pool and report whether metadata was embedded."""
+
+    def test_saves_with_metadata(self, tmp_path: Path) -> None:
+        process = _make_safety_process()
+        metadata = safety_process_module.PngImagePlugin.PngInfo()
+        metadata.add_text("Seed", "42")
+        output_path = str(tmp_path / "image.png")
+
+        saved = process._save_image(Image.new("RGB", (8, 8)), output_path, metadata, "job")
+
+        assert saved is not None
+        assert saved.metadata_embedded
+        with Image.open(output_path) as reopened:
+            assert reopened.text["Seed"] == "42"
+
+    def test_png_input_is_written_without_reencoding(self, tmp_path: Path) -> None:
+        process = _make_safety_process()
+        encoded_image = base64.b64decode(_png_base64((10, 20, 30)))
+        metadata = safety_process_module.PngImagePlugin.PngInfo()
+        metadata.add_text("Seed", "42")
+        metadata.add_text("Prompt", "ünïcode")
+        output_path = str(tmp_path / "image.png")
+
+        saved = process._save_image(Image.new("RGB", (8, 8)), output_path, metadata, "job", encoded_image)
+
+        assert saved is not None
+        assert saved.metadata_embedded
+        with Image.open(output_path) as reopened:
+            reopened.load()
+            assert reopened.text == {"Seed": "42", "Prompt": "ünïcode"}
+            assert reopened.getpixel((0, 0)) == (10, 20, 30)
+        written = (tmp_path / "image.png").read_bytes()
+        assert written.endswith(encoded_image[safety_process_module._find_first_idat_offset(encoded_image) :])
+
+    def test_non_png_input_is_reencoded(self, tmp_path: Path) -> None:
+        process = _make_safety_process()
+        buffer = BytesIO()
+        Image.new("RGB", (8, 8)).save(buffer, "jpeg")
+        output_path = str(tmp_path / "image.png")
+
+        saved = process._save_image(Image.new("RGB", (8, 8)), output_path, None, "job", buffer.getvalue())
+
+        assert saved is not None
+        assert (tmp_path / "image.png").read_bytes().startswith(safety_process_module._PNG_SIGNATURE)
+
+    def test_unwritable_path_returns_none(self, tmp_path: Path) -> None:
+        process = _make_safety_process()
+
+        saved = process._save_image(Image.new("RGB", (8, 8)), str(tmp_path / "missing" / "image.png"), None, "job")
+
+        assert saved is None
+
+
+class TestSharedPngInfoChunks:
+    """The generation metadata is rendered once per job into PNG text chunks."""
+
+    def test_prompt_is_split_and_metadata_rendered(self) -> None:
+        message = _make_message([])
+        message.generation_metadata = {
+            "seed": 42,
+            "cfg_scale": 7.5,
+            "denoising_strength": float("nan"),
+            "post_processing": ["GFPGAN", "RealESRGAN_x4plus"],
+            "loras": [{"hash": "abc"}, {"sha": "def"}],
+            "karras": True,
+        }
+
+        chunks = dict(safety_process_module._build_shared_pnginfo_chunks(message, "2024-01-01T00:00:00"))
+
+        assert chunks["Positive prompt"] == "a cat"
+        assert chunks["Negative prompt"] == "blurry"
+        assert chunks["Created at"] == "2024-01-01T00:00:00"
+        assert chunks["Seed"] == "42"
+        assert chunks["CFG scale"] == "7.5"
+        assert chunks["Denoising strength"] == "NaN"
+        assert chunks["Post processing"] == "GFPGAN, RealESRGAN_x4plus"
+        assert chunks["LoRA hashes"] == "abc, def"
+        assert chunks["Schedule type"] == "karras"
+
+    def test_unknown_fields_are_omitted(self) -> None:
+        chunks = dict(safety_process_module._build_shared_pnginfo_chunks(_make_message([]), "now"))
+
+        assert "Seed" not in chunks
+        assert "Model name" not in chunks
+
+    def test_each_image_gets_the_shared_chunks(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        process._save_image = MagicMock(return_value=None)
+        message = _make_message([_png_base64(), _png_base64()])
+        message.generation_metadata = {"seed": 7}
+
+        def _makedirs(*args: object, **kwargs: object) -> None:
+            return None
+
+        with pytest.MonkeyPatch.context() as mp:
+            mp.setattr(safety_process_module.os, "makedirs", _makedirs)
+            mp.setattr(safety_process_module.os, "chmod", MagicMock())
+            process._receive_and_handle_control_message(message)
+
+        saved_metadata = [c.args[2] for c in process._save_image.call_args_list]
+        assert len(saved_metadata) == 2
+        assert saved_metadata[0] is not saved_metadata[1]
+        for metadata in saved_metadata:
+            assert (b"tEXt", b"Seed\x007", False) in metadata.chunks
+
+
+class TestOutputDirectoryCache:
+    """The dated output directory is created once per day, not once per job."""
+
+    def test_directory_created_once_per_day(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        process = _make_safety_process()
+        makedirs = MagicMock()
+        monkeypatch.setattr(safety_process_module.os, "makedirs", makedirs)
+        monkeypatch.setattr(safety_process_module.os, "chmod", MagicMock())
+
+        first = process._get_output_directory(datetime(2024, 1, 1, 9))
+        second = process._get_output_directory(datetime(2024, 1, 1, 17))
+        next_day = process._get_output_directory(datetime(2024, 1, 2, 9))
+
+        assert first == second == "/output/2024/2024-01/2024-01-01"
+        assert next_day == "/output/2024/2024-01/2024-01-02"
+        assert makedirs.call_count == 2
+
+    def test_failure_is_retried_on_the_next_job(self) -> None:
+        process = _make_safety_process()
+
+        assert process._get_output_directory(datetime(2024, 1, 1)) is None
+        assert process._cached_output_date is None
+
+    def test_configured_base_directory(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        process = _make_safety_process()
+        process._output_base_directory = "/archive"
+        monkeypatch.setattr(safety_process_module.os, "makedirs", MagicMock())
+        monkeypatch.setattr(safety_process_module.os, "chmod", MagicMock())
+
+        assert process._get_output_directory(datetime(2024, 1, 1)) == "/archive/2024/2024-01/2024-01-01"
+
+    def test_disabled_saving_skips_directory_and_save(self) -> None:
+        process = _make_safety_process()
+        process._save_outputs = False
+        process._get_output_directory = MagicMock()
+        process._save_image = MagicMock()
+        process._batch_image_features = MagicMock(return_value=None)
+
+        process._receive_and_handle_control_message(_make_message([_png_base64()]))
+
+        process._get_output_directory.assert_not_called()
+        process._save_image.assert_not_called()
+        assert not _get_result(process).safety_evaluations[0].failed
+
+
+class TestSafetyVerdictMetadata:
+    """Every checked image is saved, with the verdict recorded in its metadata."""
+
+    def _run(self, nsfw_result: MagicMock | None, monkeypatch: pytest.MonkeyPatch) -> MagicMock:
+        process = _make_safety_process()
+        process._nsfw_checker.check_for_nsfw.return_value = nsfw_result
+        process._batch_image_features = MagicMock(return_value=None)
+        process._save_image = MagicMock(return_value=None)
+        monkeypatch.setattr(safety_process_module.os, "makedirs", MagicMock())
+        monkeypatch.setattr(safety_process_module.os, "chmod", MagicMock())
+
+        process._receive_and_handle_control_message(_make_message([_png_base64()]))
+        return process._save_image
+
+    def test_csam_image_is_saved_with_verdict(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        save_image = self._run(MagicMock(is_nsfw=True, is_csam=True), monkeypatch)
+
+        metadata = save_image.call_args.args[2]
+        assert (b"tEXt", b"Safety\x00csam", False) in metadata.chunks
+        assert (b"tEXt", b"CSAM\x00true", False) in metadata.chunks
+
+    def test_failed_check_is_not_saved(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        save_image = self._run(None, monkeypatch)
+
+        save_image.assert_not_called()
+
+    def test_metadata_can_be_disabled(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(HordeSafetyProcess, "_embed_metadata", False)
+
+        save_image = self._run(MagicMock(is_nsfw=False, is_csam=False), monkeypatch)
+
+        assert save_image.call_args.args[2] is None
+
+
+class TestMemoryReportThrottle:
+    """Per-job memory reports are rate limited by `_memory_report_interval`."""
+
+    def test_back_to_back_jobs_report_once(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        process.send_memory_report_message = MagicMock(return_value=True)
+
+        process._receive_and_handle_control_message(_make_message([_png_base64()]))
+        process._receive_and_handle_control_message(_make_message([_png_base64()]))
+
+        process.send_memory_report_message.assert_called_once_with(include_vram=False)
+
+
+class TestWarmUp:
+    """The models are exercised once at startup so the first job is not slower."""
+
+    def test_warm_up_runs_both_checks(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=["features"])
+
+        process._warm_up_models()
+
+        assert process._nsfw_checker.check_for_nsfw.call_args.kwargs["image_tensor"] == "features"
+        process._nsfw_checker.check_for_nsfw_anime_only.assert_called_once()
+
+    def test_warm_up_failure_is_not_fatal(self) -> None:
+        process = _make_safety_process()
+        process._batch_image_features = MagicMock(return_value=None)
+        process._nsfw_checker.check_for_nsfw.side_effect = RuntimeError("boom")
+
+        process._warm_up_models()
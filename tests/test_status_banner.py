@@ -0,0 +1,107 @@
+"""Tests for the periodic status banner printed by print_status_method()."""
+
+from unittest.mock import MagicMock, patch
+
+from horde_worker_regen.process_management.process_manager import (
+    _STATUS_RULE_MAJOR,
+    _STATUS_RULE_MINOR,
+    HordeWorkerProcessManager,
+)
+
+
+def _make_manager() -> MagicMock:
+    """Return a minimal mock manager with the attributes read by print_status_method."""
+    mgr = MagicMock()
+    mgr._last_pop_maintenance_mode = False
+    mgr._last_status_message_time = 0.0
+    mgr._status_message_frequency = 10.0
+    mgr._api_messages_received = {}
+    mgr._process_map.get_process_info_strings.return_value = ["process 0 info", "process 1 info"]
+    mgr._process_map.items.return_value = []
+    mgr._process_map.values.return_value = []
+    mgr.jobs_in_progress = []
+    mgr.jobs_pending_inference = []
+    mgr._last_pop_no_jobs_available = True
+    mgr._time_spent_no_jobs_available = 0.0
+    mgr._last_pop_no_jobs_available_time = 0.0
+    mgr._failed_models = {}
+    mgr._last_worker_config_print_time = 0.0
+    mgr.WORKER_CONFIG_REPORT_INTERVAL_SECONDS = 300
+    mgr.bridge_data.max_power = 32
+    mgr.bridge_data.extra_slow_worker = False
+    mgr.bridge_data.minutes_allowed_without_jobs = 30
+    mgr._device_map.root = {}
+    mgr._too_many_consecutive_failed_jobs = False
+    mgr._shutting_down = False
+    return mgr
+
+
+def test_status_banner_is_emitted_as_single_record(monkeypatch) -> None:
+    """The banner body should be joined into one logging call, followed by the closing rule."""
+    monkeypatch.delenv("AIWORKER_LIMITED_CONSOLE_MESSAGES", raising=False)
+    mgr = _make_manager()
+    bound = HordeWorkerProcessManager.print_status_method.__get__(mgr, HordeWorkerProcessManager)
+
+    with patch("horde_worker_regen.process_management.process_manager.logger") as mock_logger:
+        bound()
+
+    log_calls = mock_logger.opt.return_value.log.call_args_list
+    assert len(log_calls) == 2
+    level, banner = log_calls[0].args
+    assert level == "INFO"
+    lines = banner.split("\n")
+    assert lines[0] == _STATUS_RULE_MAJOR
+    assert _STATUS_RULE_MINOR in lines
+    assert "  process 0 info" in lines
+    assert "  No active jobs" in lines
+    assert log_calls[1].args == ("INFO", _STATUS_RULE_MAJOR)
+
+
+def test_shutdown_notice_precedes_closing_rule(monkeypatch) -> None:
+    """Warnings logged during the refresh should appear before the banner's closing rule."""
+    monkeypatch.delenv("AIWORKER_LIMITED_CONSOLE_MESSAGES", raising=False)
+    mgr = _make_manager()
+    mgr._shutting_down = True
+    bound = HordeWorkerProcessManager.print_status_method.__get__(mgr, HordeWorkerProcessManager)
+
+    with patch("horde_worker_regen.process_management.process_manager.logger") as mock_logger:
+        bound()
+
+    calls = [c for c in mock_logger.opt.return_value.mock_calls if c[0] in ("log", "warning")]
+    assert [c[0] for c in calls] == ["log", "warning", "warning", "warning", "log"]
+    assert calls[-1].args == ("INFO", _STATUS_RULE_MAJOR)
+
+
+def test_status_debug_details_are_lazy(monkeypatch) -> None:
+    """The DEBUG-only details should be built by loguru on demand, not eagerly."""
+    monkeypatch.delenv("AIWORKER_LIMITED_CONSOLE_MESSAGES", raising=False)
+    mgr = _make_manager()
+    bound = HordeWorkerProcessManager.print_status_method.__get__(mgr, HordeWorkerProcessManager)
+
+    with patch("horde_worker_regen.process_management.process_manager.logger") as mock_logger:
+        bound()
+
+    mock_logger.opt.assert_any_call(lazy=True)
+    mock_logger.debug.assert_not_called()
+    debug_args = [c.args for c in mock_logger.opt.return_value.debug.call_args_list]
+    assert debug_args and all(callable(args[-1]) for args in debug_args)
+
+
+def test_status_banner_is_plain_when_no_sink_renders_colors(monkeypatch) -> None:
+    """Without a colorized console or web UI the banner should be logged with markup stripped."""
+    monkeypatch.delenv("AIWORKER_LIMITED_CONSOLE_MESSAGES", raising=False)
+    mgr = _make_manager()
+    mgr.webui = None
+    bound = HordeWorkerProcessManager.print_status_method.__get__(mgr, HordeWorkerProcessManager)
+
+    with (
+        patch("horde_worker_regen.process_management.process_manager.logger") as mock_logger,
+        patch("horde_worker_regen.process_management.process_manager.console_colorized", return_value=False),
+    ):
+        bound()
+
+    mock_logger.opt.return_value.log.assert_not_called()
+    level, banner = mock_logger.log.call_args.args
+    assert level == "INFO"
+    assert "<fg" not in banner and "</>" not in banner
+    assert banner.split("\n")[0] == "=" * 80
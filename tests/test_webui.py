@@ -1,13 +1,21 @@
 """Simple test to verify the web UI server can be created and started."""
 
 import asyncio
+import base64
+import gzip
+import json
 import pathlib
 
 import aiohttp
 import pytest
 from loguru import logger
 
-from horde_worker_regen.webui.server import WorkerWebUI
+from horde_worker_regen.webui.server import WorkerWebUI, _json_response
+
+TINY_PNG_BASE64 = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+)
+"""A valid 1x1 PNG, base64-encoded as the worker sends images to the web UI."""
 
 
 @pytest.fixture(autouse=True)
@@ -24,6 +32,15 @@ def test_webui_creation() -> None:
     assert webui.status_data is not None
 
 
+def test_json_response_encodes_payload() -> None:
+    """_json_response produces the same JSON as web.json_response, including oversized integers."""
+    response = _json_response({"count": 3, 7: "int key", "big": 2**70}, status=201)
+
+    assert response.status == 201
+    assert response.content_type == "application/json"
+    assert json.loads(response.body) == {"count": 3, "7": "int key", "big": 2**70}
+
+
 def test_webui_status_update() -> None:
     """Test that WorkerWebUI status can be updated."""
     webui = WorkerWebUI(port=0)  # Let OS assign a port
@@ -243,9 +260,7 @@ def test_webui_new_features() -> None:
     webui = WorkerWebUI(port=0)
 
     # Test last image update (single image)
-    test_image_base64 = (
-        "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-    )
+    test_image_base64 = TINY_PNG_BASE64
     webui.update_status(last_image_base64=[test_image_base64])
     assert webui.status_data["last_image_base64"] == [test_image_base64]
 
@@ -280,7 +295,6 @@ async def test_webui_console_filter_html() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -484,7 +498,7 @@ def test_webui_images_history() -> None:
     assert webui._gallery_dict == {}
 
     # Test adding a single image entry
-    test_image_b64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+    test_image_b64 = TINY_PNG_BASE64
     webui.add_gallery_image({"base64": test_image_b64, "timestamp": 1704067205.0, "model": "stable_diffusion_xl"})
     assert len(webui._gallery_dict) == 1
     assert webui.status_data["images_count"] == 1
@@ -514,12 +528,9 @@ async def test_webui_start_stop() -> None:
     webui = WorkerWebUI(port=0)  # Let OS assign an available port
 
     try:
-        # Start the server
+        # Start the server; start() only returns once the listening socket is bound
         await webui.start()
 
-        # Give it a moment to start
-        await asyncio.sleep(0.5)
-
         # Get the actual port assigned
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
@@ -542,13 +553,9 @@ async def test_webui_gallery_thumbnail_only() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        # A minimal 1×1 PNG in base64
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Add an entry *without* a thumbnail (simulates PIL not being available)
         webui._gallery_dict[0] = {"gallery_id": 0, "base64": test_b64, "timestamp": 1.0, "model": "m1"}
@@ -585,7 +592,6 @@ async def test_webui_index_initial_gpu_and_vram_markup() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -611,8 +617,8 @@ async def test_webui_index_initial_gpu_and_vram_markup() -> None:
         assert "document.getElementById('topbar-total-ram-val').textContent = totalRamVal;" in html
         assert "const gpu = Math.max(sysGpuRaw, workerGpu);" in html
         assert "const sysVram = Math.max(vramTotalMb > 0 ? Math.min(100, Math.round((sysVramMb / vramTotalMb) * 100)) : 0, vram);" in html
-        assert "if (proc.job_id) sl.push('Job: '+escapeHtml(proc.job_id));" in html
-        assert "escapeHtml(proc.display_id || proc.id)" in html
+        assert "if (proc.job_id) sl.push('Job: '+proc.job_id);" in html
+        assert "_setTextIfChanged(node.id, proc.display_id || proc.id);" in html
         assert "if (pageId === 'stats') {" in html
         assert "fetchStats(true);" in html
         assert ".image-grid-item .image-timestamp { position: absolute; bottom: 0; left: 0; right: 0; background: rgba(0,0,0,0.6); color: #e2e8f0; font-size: 0.65rem; padding: 3px 6px; text-align: center; border-radius: 0 0 8px 8px; pointer-events: none; opacity: 1; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }" in html
@@ -649,12 +655,9 @@ async def test_webui_gallery_image_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Use add_gallery_image so gallery_id values are stamped by the server.
         webui.add_gallery_image({"base64": test_b64, "timestamp": 1.0, "model": "older"})
@@ -725,12 +728,9 @@ async def test_webui_status_excludes_images_and_last_image_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
         test_timestamp = 1704067200.0
         test_model = "stable_diffusion_xl"
         test_safety = [{"is_nsfw": True, "is_csam": False}]
@@ -767,6 +767,42 @@ async def test_webui_status_excludes_images_and_last_image_endpoint() -> None:
         await webui.stop()
 
 
+@pytest.mark.asyncio
+async def test_webui_last_image_served_as_png() -> None:
+    """/api/last_image/{index} serves the decoded PNG with an ETag, and base64 can be left out of the JSON."""
+    webui = WorkerWebUI(port=0)
+    test_png = base64.b64decode(TINY_PNG_BASE64)
+    webui.update_status(last_image_base64=[base64.b64encode(test_png).decode("ascii")])
+
+    try:
+        await webui.start()
+        base_url = f"http://localhost:{webui.site._server.sockets[0].getsockname()[1] if webui.site else 0}"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/api/last_image?include_base64=false") as response:
+                img_data = await response.json()
+            assert "last_image_base64" not in img_data
+            assert img_data["last_image_count"] == 1
+
+            async with session.get(f"{base_url}/api/last_image/0") as response:
+                assert response.status == 200
+                assert response.content_type == "image/png"
+                assert await response.read() == test_png
+                etag = response.headers["ETag"]
+            async with session.get(f"{base_url}/api/last_image/0", headers={"If-None-Match": etag}) as response:
+                assert response.status == 304
+            async with session.get(f"{base_url}/api/last_image/1") as response:
+                assert response.status == 404
+
+            # New images replace the decoded file, so the old ETag no longer matches
+            webui.update_status(last_image_base64=[base64.b64encode(test_png + b"x").decode("ascii")])
+            async with session.get(f"{base_url}/api/last_image/0", headers={"If-None-Match": etag}) as response:
+                assert response.status == 200
+                assert await response.read() == test_png + b"x"
+    finally:
+        await webui.stop()
+
+
 @pytest.mark.asyncio
 async def test_webui_gallery_metadata_only() -> None:
     """Test that /api/gallery?metadata_only=true strips both thumbnail and base64."""
@@ -774,12 +810,9 @@ async def test_webui_gallery_metadata_only() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Entry without thumbnail (base64 only)
         webui._gallery_dict[0] = {"gallery_id": 0, "base64": test_b64, "timestamp": 1.0, "model": "m1"}
@@ -810,12 +843,9 @@ async def test_webui_gallery_image_thumbnail_only() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Entry with both thumbnail and base64
         webui._gallery_dict[5] = {"gallery_id": 5, "base64": test_b64, "thumbnail": "thumb_data", "timestamp": 1.0, "model": "m1"}
@@ -862,7 +892,7 @@ def test_webui_gallery_evicts_base64_from_memory_when_persisted(tmp_path: pathli
     container). The full image must remain recoverable from the gallery database.
     """
     webui = WorkerWebUI(port=0, db_path=str(tmp_path))
-    test_b64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+    test_b64 = TINY_PNG_BASE64
 
     # Provide an explicit thumbnail so the eviction path is exercised even when Pillow is
     # unavailable to generate one from the base64.
@@ -881,10 +911,9 @@ async def test_webui_gallery_full_res_served_from_db_when_evicted(tmp_path: path
     webui = WorkerWebUI(port=0, db_path=str(tmp_path))
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
+        test_b64 = TINY_PNG_BASE64
         webui.add_gallery_image({"base64": test_b64, "timestamp": 1.0, "model": "m"})
 
         # Simulate memory eviction: the full base64 is gone from RAM but persisted in the DB.
@@ -999,7 +1028,6 @@ async def test_webui_gallery_image_thumbnail_fetched_from_db_when_evicted(tmp_pa
     webui = WorkerWebUI(port=0, db_path=str(tmp_path))
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         webui.add_gallery_image({"base64": "notapngA", "thumbnail": "thumbA", "timestamp": 1.0, "model": "m"})
@@ -1032,7 +1060,6 @@ async def test_webui_status_excludes_errors_history_and_has_errors_count() -> No
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Populate some errors
@@ -1059,6 +1086,277 @@ async def test_webui_status_excludes_errors_history_and_has_errors_count() -> No
         await webui.stop()
 
 
+@pytest.mark.asyncio
+async def test_webui_status_etag_and_invalidation() -> None:
+    """/api/status answers a matching If-None-Match with 304 and re-encodes after update_status."""
+    webui = WorkerWebUI(port=0, update_interval=60.0)
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+        url = f"http://localhost:{actual_port}/api/status"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                assert response.status == 200
+                etag = response.headers["ETag"]
+
+            async with session.get(url, headers={"If-None-Match": etag}) as response:
+                assert response.status == 304
+
+            webui.update_status(jobs_queued=5)
+            async with session.get(url, headers={"If-None-Match": etag}) as response:
+                assert response.status == 200
+                assert response.headers["ETag"] != etag
+                assert (await response.json())["jobs_queued"] == 5
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_status_uptime_is_derived_per_encode() -> None:
+    """/api/status reports uptime from the session start even without an update_status push."""
+    webui = WorkerWebUI(port=0)
+    webui._session_start_monotonic -= 3600
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+
+        async with aiohttp.ClientSession() as session, session.get(
+            f"http://localhost:{actual_port}/api/status",
+        ) as response:
+            status = await response.json()
+        assert status["uptime"] >= 3600
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_status_uptime_advances_between_encodes() -> None:
+    """Each re-encode of /api/status reports the uptime at that encode, not a stale one."""
+    # update_interval=0 re-encodes on every poll
+    webui = WorkerWebUI(port=0, update_interval=0.0)
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+        url = f"http://localhost:{actual_port}/api/status"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(url) as response:
+                first_uptime = (await response.json())["uptime"]
+
+            # Simulate time passing by back-dating the monotonic start that uptime is measured from
+            webui._session_start_monotonic -= 60
+            async with session.get(url) as response:
+                second_uptime = (await response.json())["uptime"]
+
+        assert second_uptime >= first_uptime + 60
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_status_large_body_is_gzipped() -> None:
+    """A large /api/status body is served pre-compressed to clients that accept gzip."""
+    webui = WorkerWebUI(port=0)
+    webui.update_status(worker_name="w" * 5000)
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+
+        async with aiohttp.ClientSession() as session, session.get(
+            f"http://localhost:{actual_port}/api/status",
+            headers={"Accept-Encoding": "gzip"},
+        ) as response:
+            assert response.status == 200
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert (await response.json())["worker_name"] == "w" * 5000
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_index_gzip_matches_identity() -> None:
+    """The spliced gzip index page decompresses to exactly the uncompressed page."""
+    webui = WorkerWebUI(port=0)
+    webui._horde_snapshots.append({"t": 1, "workers": 2})
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            async with session.get(
+                f"http://localhost:{actual_port}/",
+                headers={"Accept-Encoding": "identity"},
+            ) as response:
+                assert "Content-Encoding" not in response.headers
+                identity_body = await response.read()
+            async with session.get(
+                f"http://localhost:{actual_port}/",
+                headers={"Accept-Encoding": "gzip"},
+            ) as response:
+                assert response.headers["Content-Encoding"] == "gzip"
+                gzipped_body = await response.read()
+        assert gzip.decompress(gzipped_body) == identity_body
+        assert b'var _hordeSnapshots = [{"t": 1, "workers": 2}];' in identity_body
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_index_brotli_matches_identity() -> None:
+    """Browsers that accept br get the index page brotli-compressed, rebuilt when the snapshots change."""
+    brotli = pytest.importorskip("brotli")
+    webui = WorkerWebUI(port=0)
+    webui._horde_snapshots.append({"t": 1, "workers": 2})
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            for snapshot in ({"t": 2, "workers": 3}, None):
+                async with session.get(
+                    f"http://localhost:{actual_port}/",
+                    headers={"Accept-Encoding": "identity"},
+                ) as response:
+                    identity_body = await response.read()
+                async with session.get(
+                    f"http://localhost:{actual_port}/",
+                    headers={"Accept-Encoding": "gzip, deflate, br"},
+                ) as response:
+                    assert response.headers["Content-Encoding"] == "br"
+                    assert brotli.decompress(await response.read()) == identity_body
+                if snapshot is not None:
+                    webui._horde_snapshots.append(snapshot)
+        assert b'{"t": 2, "workers": 3}' in identity_body
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_index_brotli_concurrent_loads_share_one_compress(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Concurrent first loads of the index page wait for one brotli compression instead of each starting one."""
+    brotli = pytest.importorskip("brotli")
+    import horde_worker_regen.webui.server as server_module
+
+    compress_calls: list[int] = []
+    # `brotli` is the same module object as `server_module.brotli`, so keep the original before patching it
+    real_compress = brotli.compress
+
+    def _counting_compress(data: bytes, **kwargs: object) -> bytes:
+        compress_calls.append(len(data))
+        return real_compress(data, **kwargs)
+
+    monkeypatch.setattr(server_module.brotli, "compress", _counting_compress)
+    webui = WorkerWebUI(port=0)
+
+    try:
+        await webui.start()
+        actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
+
+        async def _load(session: aiohttp.ClientSession) -> bytes:
+            async with session.get(
+                f"http://localhost:{actual_port}/",
+                headers={"Accept-Encoding": "br"},
+            ) as response:
+                assert response.headers["Content-Encoding"] == "br"
+                return await response.read()
+
+        async with aiohttp.ClientSession(auto_decompress=False) as session:
+            bodies = await asyncio.gather(*(_load(session) for _ in range(4)))
+        assert len(compress_calls) == 1
+        assert len(set(bodies)) == 1
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_console_logs_endpoint_deltas() -> None:
+    """/api/console_logs sends only lines past the client's cursor, and the whole window otherwise."""
+    webui = WorkerWebUI(port=0)
+    webui.update_status(console_logs=["a", "b", "c"], console_logs_seq=3)
+
+    try:
+        await webui.start()
+        base_url = f"http://localhost:{webui.site._server.sockets[0].getsockname()[1] if webui.site else 0}"
+
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/api/status") as response:
+                status = await response.json()
+            assert "console_logs" not in status
+            assert status["console_logs_seq"] == 3
+
+            async with session.get(f"{base_url}/api/console_logs") as response:
+                assert await response.json() == {"seq": 3, "complete": True, "window": 3, "logs": ["a", "b", "c"]}
+
+            webui.update_status(console_logs=["b", "c", "d", "e"], console_logs_seq=5)
+            async with session.get(f"{base_url}/api/console_logs?since=3") as response:
+                assert await response.json() == {"seq": 5, "complete": False, "window": 4, "logs": ["d", "e"]}
+            async with session.get(f"{base_url}/api/console_logs?since=5") as response:
+                assert (await response.json())["logs"] == []
+            # The window has moved past line 0, so the client has to replace what it holds
+            async with session.get(f"{base_url}/api/console_logs?since=0") as response:
+                assert (await response.json())["complete"] is True
+
+            # Logs replaced without a sequence can't be related to the old cursor
+            webui.update_status(console_logs=["x"])
+            async with session.get(f"{base_url}/api/console_logs?since=5") as response:
+                assert await response.json() == {"seq": 6, "complete": True, "window": 1, "logs": ["x"]}
+    finally:
+        await webui.stop()
+
+
+@pytest.mark.asyncio
+async def test_webui_console_logs_endpoint_cursor_boundaries() -> None:
+    """/api/console_logs treats the edges of the window and of an unsequenced update correctly."""
+    webui = WorkerWebUI(port=0)
+    webui.update_status(console_logs=["b", "c", "d", "e"], console_logs_seq=5)
+
+    try:
+        await webui.start()
+        base_url = f"http://localhost:{webui.site._server.sockets[0].getsockname()[1] if webui.site else 0}"
+
+        async with aiohttp.ClientSession() as session:
+            # since == seq - len(logs): the cursor sits just before the oldest line, so every line is new
+            async with session.get(f"{base_url}/api/console_logs?since=1") as response:
+                assert await response.json() == {
+                    "seq": 5,
+                    "complete": False,
+                    "window": 4,
+                    "logs": ["b", "c", "d", "e"],
+                }
+            # since > seq: a cursor from the future (e.g. a previous worker run) gets the whole window
+            async with session.get(f"{base_url}/api/console_logs?since=6") as response:
+                assert await response.json() == {
+                    "seq": 5,
+                    "complete": True,
+                    "window": 4,
+                    "logs": ["b", "c", "d", "e"],
+                }
+
+            # An update without a seq moves min_since to the new seq; older cursors must refetch the window
+            webui.update_status(console_logs=["x", "y"])
+            assert webui._console_logs_min_since == 6
+            async with session.get(f"{base_url}/api/console_logs?since=5") as response:
+                assert (await response.json())["complete"] is True
+            async with session.get(f"{base_url}/api/console_logs?since=6") as response:
+                assert await response.json() == {"seq": 6, "complete": False, "window": 2, "logs": []}
+
+            # Later sequenced updates slice from min_since onwards, but still not from before it
+            webui.update_status(console_logs=["x", "y", "z", "w"], console_logs_seq=8)
+            async with session.get(f"{base_url}/api/console_logs?since=6") as response:
+                assert await response.json() == {"seq": 8, "complete": False, "window": 4, "logs": ["z", "w"]}
+            async with session.get(f"{base_url}/api/console_logs?since=5") as response:
+                assert (await response.json())["complete"] is True
+    finally:
+        await webui.stop()
+
+
 @pytest.mark.asyncio
 async def test_webui_errors_endpoint_pagination() -> None:
     """Test /api/errors returns paginated slices of the error history."""
@@ -1066,7 +1364,6 @@ async def test_webui_errors_endpoint_pagination() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Add 25 errors
@@ -1125,7 +1422,6 @@ async def test_webui_errors_endpoint_edge_cases() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Empty history
@@ -1185,7 +1481,6 @@ async def test_webui_status_includes_images_per_hour() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         webui.update_status(images_per_hour=7.5)
@@ -1287,7 +1582,6 @@ async def test_webui_status_api_includes_user_details() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         webui.update_status(user_details=user_details)
@@ -1355,7 +1649,6 @@ async def test_delete_worker_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # 404 for unknown worker
@@ -1472,7 +1765,6 @@ async def test_webui_errors_grouped_endpoint_basic() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Empty history returns empty groups
@@ -1530,7 +1822,6 @@ async def test_webui_errors_grouped_endpoint_normalisation() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         uuid1 = "11111111-2222-3333-4444-555555555555"
@@ -1576,7 +1867,6 @@ async def test_webui_errors_grouped_normalises_timestamps() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Simulate the same error logged at different times in the webui HH:mm:ss format
@@ -1614,7 +1904,6 @@ async def test_webui_errors_grouped_normalises_short_ids() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Short process IDs (2+ digits) that were previously not normalised
@@ -1653,7 +1942,6 @@ async def test_webui_errors_grouped_normalises_single_digit_process_numbers() ->
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Single-digit process/slot numbers that should be normalised to the same key.
@@ -1690,7 +1978,6 @@ async def test_webui_errors_grouped_endpoint_pagination() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # 15 distinct error types, each appearing twice.  Use letter-based labels so
@@ -1733,7 +2020,6 @@ async def test_webui_errors_grouped_occurrences_contain_individual_messages() ->
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Three distinct timestamps → three occurrences of the same logical error.
@@ -1783,7 +2069,6 @@ async def test_webui_errors_grouped_occurrences_capped_at_max() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         total = _MAX_OCCURRENCES_PER_GROUP + 10
@@ -1811,7 +2096,6 @@ async def test_webui_errors_grouped_endpoint_edge_cases() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # "err b" appears only once but will still be included; "err a" appears twice
@@ -1851,7 +2135,6 @@ async def test_webui_stats_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Initially the snapshot list should be empty.
@@ -2074,7 +2357,6 @@ async def test_job_pops_pause_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # --- success: pause with no duration_seconds → indefinite ---
@@ -2216,7 +2498,6 @@ async def test_time_without_jobs_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # --- default: no status pushed yet -> 0.0 ---
@@ -2265,12 +2546,9 @@ async def test_webui_gallery_model_filter() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         webui.add_gallery_image({"base64": test_b64, "timestamp": 1.0, "model": "stable_diffusion"})
         webui.add_gallery_image({"base64": test_b64, "timestamp": 2.0, "model": "sdxl"})
@@ -2339,12 +2617,9 @@ async def test_webui_gallery_safety_filter() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         webui.add_gallery_image({"base64": test_b64, "timestamp": 1.0, "model": "stable_diffusion"})
         webui.add_gallery_image({"base64": test_b64, "timestamp": 2.0, "model": "stable_diffusion", "is_nsfw": True})
@@ -2403,12 +2678,9 @@ async def test_webui_gallery_models_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Empty gallery: models list should be empty.
         async with aiohttp.ClientSession() as session, session.get(
@@ -2451,12 +2723,9 @@ async def test_webui_gallery_safety_endpoint() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
-        test_b64 = (
-            "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg=="
-        )
+        test_b64 = TINY_PNG_BASE64
 
         # Empty gallery.
         async with aiohttp.ClientSession() as session, session.get(
@@ -2496,7 +2765,6 @@ async def test_webui_stats_job_state_time_container() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -2565,8 +2833,8 @@ async def test_webui_stats_job_state_time_container() -> None:
         assert "--action-btn-height: 32px;" in html
         assert ".theme-toggle, .nsfw-blur-btn, .clear-maintenance-btn, .limit-set-btn, .limit-auto-btn, .console-pause-btn, .console-copy-btn, .job-pops-pause-btn, .errors-view-btn, .pagination-controls button, .image-overlay-close, .worker-delete-btn, .stats-window-btn, .horde-window-btn, .settings-page-btn, .setting-apply-btn, .confirm-modal-btn {" in html
         assert ".topbar-uptime, .status-badge, .job-state-badge, .process-type-badge, .process-state-badge, .model-badge, .worker-version-badge, .worker-type-badge, .worker-online-badge, .wcap {\n            height: var(--action-btn-height);" in html
-        assert "<span class=\"process-state-badge\">'+escapeHtml(proc.state)+'</span><span class=\"process-type-badge\">'+escapeHtml(proc.type)+'</span>" in html
-        assert "<span class=\"process-type-badge\">'+escapeHtml(proc.type)+'</span><span class=\"process-state-badge\">'+escapeHtml(proc.state)+'</span>" not in html
+        assert "state: el('span', 'process-state-badge', idRow),\n                type: el('span', 'process-type-badge', idRow)," in html
+        assert "type: el('span', 'process-type-badge', idRow),\n                state: el('span', 'process-state-badge', idRow)," not in html
         assert ".setting-number { width: 68px; height: var(--action-btn-height);" in html
         assert ".limit-input { width: 54px; height: var(--action-btn-height);" in html
         assert "autoBtn.setAttribute('aria-pressed', 'true');" in html
@@ -2592,7 +2860,6 @@ async def test_webui_stats_per_model_time_containers() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -2639,7 +2906,6 @@ async def test_webui_settings_post_max_queue_size_controls() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # --- success: set manual value ---
@@ -2758,7 +3024,6 @@ async def test_webui_settings_post_max_active_model_controls() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # --- success: set manual value ---
@@ -2863,7 +3128,6 @@ async def test_max_queue_size_and_active_models_in_status() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -2891,7 +3155,6 @@ async def test_webui_settings_get_empty() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -2924,7 +3187,6 @@ async def test_webui_settings_update_settings_data() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Push a snapshot of settings
@@ -2967,7 +3229,6 @@ async def test_webui_settings_post_bool() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3005,7 +3266,6 @@ async def test_webui_settings_post_numeric() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Valid update
@@ -3050,7 +3310,6 @@ async def test_webui_settings_post_unknown_key() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3071,7 +3330,6 @@ async def test_webui_settings_post_readonly_key() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3093,7 +3351,6 @@ async def test_webui_settings_get_includes_horde_url() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3115,7 +3372,6 @@ async def test_webui_settings_get_includes_webui_url() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.port
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3138,7 +3394,6 @@ async def test_webui_settings_post_rejects_webui_url() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.port
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3160,7 +3415,6 @@ async def test_webui_settings_post_no_callback() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3258,7 +3512,6 @@ async def test_webui_restart_post_calls_callback() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3280,7 +3533,6 @@ async def test_webui_restart_post_no_callback() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3343,7 +3595,6 @@ async def test_webui_settings_html_nav_and_page() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3384,7 +3635,6 @@ async def test_webui_api_page_html() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3431,7 +3681,6 @@ async def test_webui_about_page_html() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3470,7 +3719,6 @@ async def test_webui_last_result_time_ago_shown_for_gallery_preview() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3506,7 +3754,6 @@ async def test_webui_settings_post_float() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.post(
@@ -3546,7 +3793,6 @@ async def test_webui_settings_auto_restart_on_idle() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Valid update — set to 120 minutes
@@ -3598,7 +3844,6 @@ async def test_webui_models_get_empty() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3618,7 +3863,6 @@ async def test_webui_models_get_with_data() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         webui.update_models_data(
@@ -3656,7 +3900,6 @@ async def test_webui_models_toggle() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Disable a model
@@ -3708,7 +3951,6 @@ async def test_webui_models_toggle_invalid() -> None:
 
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         # Missing model field
@@ -3748,7 +3990,6 @@ async def test_webui_models_section_html() -> None:
     webui = WorkerWebUI(port=0)
     try:
         await webui.start()
-        await asyncio.sleep(0.5)
         actual_port = webui.site._server.sockets[0].getsockname()[1] if webui.site else 0
 
         async with aiohttp.ClientSession() as session, session.get(
@@ -3782,8 +4023,8 @@ def test_webui_reset_session_start_time_resets_uptime() -> None:
     import time
 
     webui = WorkerWebUI(port=0)
-    # Simulate time passing by back-dating the session start
-    webui.status_data["session_start_time"] = time.time() - 3600
+    # Simulate time passing by back-dating the monotonic start that uptime is measured from
+    webui._session_start_monotonic -= 3600
     webui.update_status()
 
     assert webui.status_data["uptime"] >= 3600, "uptime should reflect elapsed time before reset"